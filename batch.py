@@ -0,0 +1,234 @@
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+from config import (
+    CONFIG,
+    DECISIONS,
+    MIN_DSCR,
+    MIN_LOAN_AMOUNT,
+    SME_PROFILES,
+    SME_LOAN_BANDS,
+    SMEProfile,
+    CreditProfile,
+    DSCRLevel,
+    SME_CONFIDENCE_ADJUSTMENTS,
+    RISK_CONFIDENCE_ADJUSTMENTS,
+    DSCR_CONFIDENCE_ADJUSTMENTS,
+    INDUSTRY_CONFIDENCE_ADJUSTMENTS,
+    SME_RISK_SCORES,
+    DSCR_RISK_SCORES,
+    CREDIT_RISK_SCORES,
+    INDUSTRY_RISK_SCORES,
+    WEIGHT_SME,
+    WEIGHT_DSCR,
+    WEIGHT_CREDIT,
+    WEIGHT_INDUSTRY
+)
+from logic import (
+    EVALUATED_SME_PROFILES,
+    _RULE_ENTRIES,
+    _RULE_TABLE,
+    _DSCR_EDGES,
+    _conditional_explanation,
+    _dscr_floor_explanation,
+    _limit_fail,
+    _min_amount_explanation,
+    _unsupported_profile_explanation
+)
+
+# --------------------------------------------------
+# Batch Scoring
+# --------------------------------------------------
+# Vectorized counterparts of adjust_confidence / calculate_overall_risk for scoring whole
+# applicant populations (backtesting, stress tests, portfolio reruns). Categorical inputs are
+# integer codes (the SMEProfile / CreditProfile / DSCRLevel values, or positions in
+# INDUSTRY_ORDER); the extra trailing code (len(order)) means "unknown" and maps to the same
+# defaults the scalar functions use.
+
+SME_ORDER = tuple(m.name for m in SMEProfile)
+RISK_ORDER = tuple(m.name for m in CreditProfile)
+DSCR_ORDER = tuple(m.name for m in DSCRLevel)
+INDUSTRY_ORDER = tuple(INDUSTRY_RISK_SCORES)
+LOAN_TYPE_ORDER = ("unsecured", "secured")
+
+def _table(order, values: dict, default: float) -> np.ndarray:
+    return np.array([values.get(k, default) for k in order] + [default], dtype=np.float64)
+
+# Confidence tables
+_SME_BASE_VEC = np.array(
+    [SME_PROFILES[k]["confidence"] + SME_CONFIDENCE_ADJUSTMENTS.get(k, 0.0) for k in SME_ORDER] + [0.75],
+    dtype=np.float64
+)
+_RISK_CONF_VEC = _table(RISK_ORDER, RISK_CONFIDENCE_ADJUSTMENTS, 0.0)
+_DSCR_CONF_VEC = _table(DSCR_ORDER, DSCR_CONFIDENCE_ADJUSTMENTS, 0.0)
+_INDUSTRY_CONF_VEC = _table(INDUSTRY_ORDER, INDUSTRY_CONFIDENCE_ADJUSTMENTS, 0.0)
+
+# Risk curve tables
+_SME_RISK_VEC = _table(SME_ORDER, SME_RISK_SCORES, 2.0)
+_DSCR_RISK_VEC = _table(DSCR_ORDER, DSCR_RISK_SCORES, 2.0)
+_CREDIT_RISK_VEC = _table(RISK_ORDER, CREDIT_RISK_SCORES, 2.0)
+_INDUSTRY_RISK_VEC = _table(INDUSTRY_ORDER, INDUSTRY_RISK_SCORES, 2.0)
+
+@lru_cache(maxsize=None)
+def _index(order: tuple) -> dict:
+    # Code lookup for an *_ORDER tuple, built once per order rather than on every encode() call
+    return {k: i for i, k in enumerate(order)}
+
+def encode(values, order) -> np.ndarray:
+    """
+    Converts a sequence of category strings into integer codes for the given *_ORDER tuple.
+    Values not present in the order are encoded as len(order) ("unknown").
+    """
+    index = _index(tuple(order))
+    unknown = len(order)
+    return np.fromiter((index.get(v, unknown) for v in values), dtype=np.intp, count=len(values))
+
+def adjust_confidence_batch(sme_codes, requested_loan, min_loan, max_loan,
+                            risk_codes, dscr_codes, industry_codes) -> np.ndarray:
+    """
+    Vectorized adjust_confidence. Loan arguments may be arrays or scalars (broadcast).
+    """
+    requested_loan = np.asarray(requested_loan, dtype=np.float64)
+    min_loan = np.asarray(min_loan, dtype=np.float64)
+    max_loan = np.asarray(max_loan, dtype=np.float64)
+
+    factor = CONFIG["loan_adjustment_factor"]
+    denominator = np.where(max_loan != min_loan, max_loan - min_loan, 1.0)
+    reduction = ((requested_loan - min_loan) / denominator) * factor
+    out = np.maximum(_SME_BASE_VEC[sme_codes] - reduction, 0.50)
+    out += _RISK_CONF_VEC[risk_codes]
+    out += _DSCR_CONF_VEC[dscr_codes]
+    out += _INDUSTRY_CONF_VEC[industry_codes]
+    # Not clipped in place: with all-scalar inputs `out` is a NumPy scalar, not an array
+    return np.clip(out, 0.50, 1.00)
+
+def calculate_overall_risk_batch(sme_codes, dscr_codes, credit_codes, industry_codes) -> np.ndarray:
+    """
+    Vectorized calculate_overall_risk.
+    """
+    return (WEIGHT_SME * _SME_RISK_VEC[sme_codes] +
+            WEIGHT_DSCR * _DSCR_RISK_VEC[dscr_codes] +
+            WEIGHT_CREDIT * _CREDIT_RISK_VEC[credit_codes] +
+            WEIGHT_INDUSTRY * _INDUSTRY_RISK_VEC[industry_codes])
+
+# --------------------------------------------------
+# Batch Decisions
+# --------------------------------------------------
+# _RULE_TABLE flattened into dense arrays indexed [sme, risk, dscr_band, loan_type]. Cells with no
+# rule get a -inf cap so every amount misses them. Borrowing limits are indexed [sme, secured].
+_N_BANDS = len(_DSCR_EDGES) + 1
+
+_RULE_SHAPE = (len(SME_ORDER) + 1, len(RISK_ORDER) + 1, _N_BANDS, len(LOAN_TYPE_ORDER) + 1)
+_RULE_CAP = np.full(_RULE_SHAPE, -np.inf)
+_RULE_CONF = np.full(_RULE_SHAPE, np.nan)
+_RULE_ID = np.full(_RULE_SHAPE, -1, dtype=np.intp)
+# Keyed on the rule's Decision: a compiled logic module re-boxes the entry tuples themselves
+_ENTRY_ID = {id(entry[1]): i for i, entry in enumerate(_RULE_ENTRIES)}
+for (_sme, _risk, _band, _ltype), _entry in _RULE_TABLE.items():
+    _idx = (_index(SME_ORDER)[_sme], _index(RISK_ORDER)[_risk], _band, _index(LOAN_TYPE_ORDER)[_ltype])
+    _RULE_CAP[_idx] = _entry[0]
+    _RULE_CONF[_idx] = _entry[1].confidence
+    _RULE_ID[_idx] = _ENTRY_ID[id(_entry[1])]
+
+# The shared Decision for each rule id returned by evaluate_batch
+RULE_DECISIONS = tuple(entry[1] for entry in _RULE_ENTRIES)
+
+_LIMIT_MIN = np.array(
+    [[SME_LOAN_BANDS[(k, "unsecured")].min, SME_LOAN_BANDS[(k, "secured")].min] for k in SME_ORDER] + [[0, 0]],
+    dtype=np.float64
+)
+_LIMIT_MAX = np.array(
+    [[SME_LOAN_BANDS[(k, "unsecured")].max, SME_LOAN_BANDS[(k, "secured")].max] for k in SME_ORDER] + [[0, 0]],
+    dtype=np.float64
+)
+_EVALUATED_VEC = np.array([k in EVALUATED_SME_PROFILES for k in SME_ORDER] + [False])
+
+# Outcome codes returned by evaluate_batch
+OUTCOME_ORDER = (None, DECISIONS["FAIL"]["value"], DECISIONS["PROGRESS"]["value"])
+NO_RULE, FAIL, PROGRESS = 0, 1, 2
+
+_CONDITIONAL_PASS = DECISIONS["CONDITIONAL_PASS"]["value"]
+_FAIL = DECISIONS["FAIL"]["value"]
+
+# Hard-stop reason codes returned by evaluate_batch, in the order evaluate_application checks them
+NO_REASON, DSCR_FLOOR, MIN_AMOUNT, UNSUPPORTED_PROFILE, BELOW_LIMIT, ABOVE_LIMIT = range(6)
+
+def evaluate_batch(df) -> dict:
+    """
+    Vectorized decision stage of evaluate_application for a whole batch. `df` is anything indexable
+    by column name (a pandas DataFrame or a dict of sequences) with sme_profile, risk_profile,
+    dscr, loan_amount and loan_type columns.
+
+    Returns {"outcome": int codes into OUTCOME_ORDER, "confidence": float64, "rule": intp,
+    "reason": intp}.
+    PROGRESS rows are the ones evaluate_application would go on to mark CONDITIONAL_PASS, and
+    "rule" indexes their decision in RULE_DECISIONS (-1 on every other row); NO_RULE rows are
+    scenarios the risk evaluators do not cover (confidence is NaN). "reason" is the first hard stop
+    each FAIL row hit (NO_REASON on every other row).
+    """
+    loan_type = list(df["loan_type"])
+    sme = encode(df["sme_profile"], SME_ORDER)
+    risk = encode(df["risk_profile"], RISK_ORDER)
+    ltype = encode(loan_type, LOAN_TYPE_ORDER)
+    # Borrowing limits match loan_type case-insensitively; the rules themselves do not
+    secured = np.fromiter((t.lower() == "secured" for t in loan_type), dtype=np.intp, count=len(loan_type))
+    dscr = np.asarray(df["dscr"], dtype=np.float64)
+    loan_amount = np.asarray(df["loan_amount"], dtype=np.float64)
+    # NaN DSCR sorts past every edge; like the scalar path it belongs below the floor
+    band = np.where(np.isnan(dscr), 0, np.searchsorted(_DSCR_EDGES, dscr, side="right"))
+
+    stops = [
+        dscr < MIN_DSCR,
+        loan_amount < MIN_LOAN_AMOUNT,
+        ~_EVALUATED_VEC[sme],
+        loan_amount < _LIMIT_MIN[sme, secured],
+        loan_amount > _LIMIT_MAX[sme, secured],
+    ]
+    reason = np.select(stops, [DSCR_FLOOR, MIN_AMOUNT, UNSUPPORTED_PROFILE, BELOW_LIMIT, ABOVE_LIMIT], NO_REASON)
+    hard_stop = reason != NO_REASON
+    matched = ~hard_stop & (loan_amount <= _RULE_CAP[sme, risk, band, ltype])
+
+    outcome = np.select([hard_stop, matched], [FAIL, PROGRESS], NO_RULE)
+    confidence = np.select([hard_stop, matched], [0.99, _RULE_CONF[sme, risk, band, ltype]], np.nan)
+    rule = np.where(matched, _RULE_ID[sme, risk, band, ltype], -1)
+    return {"outcome": outcome, "confidence": confidence, "rule": rule, "reason": reason}
+
+def decision_columns(df, result: dict) -> dict:
+    """
+    Reports evaluate_batch output the way evaluate_application reports a single application:
+    {"decision", "confidence", "explanation"} lists, with PROGRESS rows as CONDITIONAL_PASS and
+    None in every column where no rule covers the scenario. `df` is the batch that was evaluated.
+    """
+    sme_profile = list(df["sme_profile"])
+    dscr = list(df["dscr"])
+    loan_amount = list(df["loan_amount"])
+    loan_type = list(df["loan_type"])
+    decisions: List[Optional[str]] = []
+    confidences: List[Optional[float]] = []
+    explanations: List[Optional[str]] = []
+    for row, (outcome, confidence, rule, reason) in enumerate(zip(
+        result["outcome"].tolist(), result["confidence"].tolist(), result["rule"].tolist(), result["reason"].tolist()
+    )):
+        if outcome == PROGRESS:
+            decisions.append(_CONDITIONAL_PASS)
+            explanations.append(_conditional_explanation(RULE_DECISIONS[rule].explanation))
+        elif outcome == FAIL:
+            decisions.append(_FAIL)
+            explanations.append(_fail_explanation(reason, sme_profile[row], dscr[row], loan_amount[row], loan_type[row]))
+        else:
+            decisions.append(None)
+            explanations.append(None)
+        confidences.append(None if outcome == NO_RULE else confidence)
+    return {"decision": decisions, "confidence": confidences, "explanation": explanations}
+
+def _fail_explanation(reason: int, sme_profile: str, dscr: float, loan_amount: float, loan_type: str) -> str:
+    if reason == DSCR_FLOOR:
+        return _dscr_floor_explanation(dscr)
+    if reason == MIN_AMOUNT:
+        return _min_amount_explanation(loan_amount)
+    if reason == UNSUPPORTED_PROFILE:
+        return _unsupported_profile_explanation(sme_profile)
+    limits = SME_LOAN_BANDS[(sme_profile, "secured" if loan_type.lower() == "secured" else "unsecured")]
+    if reason == BELOW_LIMIT:
+        return _limit_fail(sme_profile, loan_type, "min", limits.min, loan_amount).explanation
+    return _limit_fail(sme_profile, loan_type, "max", limits.max, loan_amount).explanation
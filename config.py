@@ -1,17 +1,29 @@
-import os
+import sys
+import atexit
 import logging
-import copy
-from datetime import datetime
-from pydantic import BaseModel
-from typing import Dict, List
-from gpt_client import call_gpt
+import logging.handlers
+import queue
+from types import MappingProxyType
+from enum import IntEnum
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
 
-# Use call_gpt(...) wherever you need GPT
+def freeze(value: Any) -> Any:
+    """
+    Recursively wraps dicts in read-only MappingProxyType views and turns lists into tuples,
+    so static configuration can be shared between callers without defensive copies.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
 
 # --------------------------------------------------
 # DECISIONS Definitions
 # --------------------------------------------------
-DECISIONS = {
+DECISIONS: Mapping[str, Any] = {
     "PROGRESS": {
          "value": "PROGRESS",
          "definition": "The application has met the preliminary criteria and is advanced to the next stage for further evaluation, including documentation and condition checks."
@@ -33,11 +45,12 @@ DECISIONS = {
         "definition": "The application requires an underwriter review."
     }
 }
+DECISIONS = freeze(DECISIONS)
 
 # --------------------------------------------------
 # SME_PROFILES Dictionary
 # --------------------------------------------------
-SME_PROFILES = {
+SME_PROFILES: Mapping[str, Any] = {
     "EB": {
         "label": "Established Business",
         "confidence": 0.95,
@@ -91,75 +104,206 @@ SME_PROFILES = {
         "financials_required": ["No management accounts, pre-revenue"]
     }
 }
+SME_PROFILES = freeze(SME_PROFILES)
+
+@dataclass(frozen=True, slots=True)
+class LoanBand:
+    """Borrowing limits for one SME profile and loan type."""
+    min: int
+    max: int
+
+# Flattened borrowing limits keyed by (sme_profile, loan_type), e.g. ("EB", "secured"): one
+# probe + slot reads instead of three nested dict lookups into SME_PROFILES
+SME_LOAN_BANDS: Mapping[Tuple[str, str], LoanBand] = MappingProxyType({
+    (profile, loan_type): LoanBand(**values[f"loan_{loan_type}"])
+    for profile, values in SME_PROFILES.items()
+    for loan_type in ("secured", "unsecured")
+})
 
 #---------------------------------------------------
 # Risk Profiles
 # --------------------------------------------------
-RISK_PROFILES = {
+RISK_PROFILES: Mapping[str, Any] = {
     "T1": {"label": "Low Risk", "missed_payments": (0, 1), "ccjs_defaults": (0, 2500), "iva_liquidation_years": 5, "confidence": 0.95},
     "T2": {"label": "Medium Risk", "missed_payments": (0, 2), "ccjs_defaults": (2500, 3000), "iva_liquidation_years": 5, "confidence": 0.85},
     "T3": {"label": "High Risk", "missed_payments": (3, float('inf')), "ccjs_defaults": (3000, 5000), "iva_liquidation_years": 5, "confidence": 0.70}
 }
+RISK_PROFILES = freeze(RISK_PROFILES)
+
+#---------------------------------------------------
+# Categorical Codes
+# --------------------------------------------------
+# Integer codes for the categorical inputs. Member names match the string keys used by the
+# tables in this module, so a key decodes with e.g. SMEProfile["EB"] and the codes can index
+# flat arrays/tuples (see batch.py).
+class SMEProfile(IntEnum):
+    EB = 0
+    ESB = 1
+    NTB = 2
+    SU = 3
+
+class CreditProfile(IntEnum):
+    T1 = 0
+    T2 = 1
+    T3 = 2
+
+class DSCRLevel(IntEnum):
+    high = 0
+    medium = 1
+    low = 2
 
 #---------------------------------------------------
 # Industry Sectors
 # --------------------------------------------------
-ACCEPTABLE_INDUSTRY_SECTORS = [
-    "Construction",
-    "Professional, Scientific, and Technical Activities",
-    "Wholesale and Retail Trade",
-    "Other Service Activities",
-    "Human Health and Social Work Activities",
-    "Information and Communication",
-    "Transportation and Storage",
-    "Education",
-    "Arts, Entertainment, and Recreation",
-    "Manufacturing",
-    "Accommodation and Food Service Activities",
-    "Agriculture, Forestry, and Fishing",
-    "Real Estate Activities",
-    "Administrative and Support Service Activities",
-    "Financial and Insurance Activities"
-]
-ACCEPTABLE_INDUSTRY_RISK_SCORES = {
-    "Construction": 1,
-    "Professional, Scientific, and Technical Activities": 1,
-    "Wholesale and Retail Trade": 1,
-    "Other Service Activities": 1,
-    "Human Health and Social Work Activities": 1,
-    "Information and Communication": 1,
-    "Transportation and Storage": 1,
-    "Education": 1,
-    "Arts, Entertainment, and Recreation": 1,
-    "Manufacturing": 1,
-    "Accommodation and Food Service Activities": 1,
-    "Agriculture, Forestry and Fishing": 1,
-    "Real Estate Activities": 1,
-    "Administrative and Support Service Activities": 1,
-    "Financial and Insurance Activities": 1
-}
-FAILED_INDUSTRY_SECTORS = [
+# Single source of truth for acceptable sectors: (name, risk score, confidence adjustment)
+_INDUSTRY_TABLE: Tuple[Tuple[str, float, float], ...] = (
+    ("Construction", 1.0, 0.00),
+    ("Professional, Scientific, and Technical Activities", 1.0, 0.00),
+    ("Wholesale and Retail Trade", 1.0, 0.00),
+    ("Other Service Activities", 1.0, 0.00),
+    ("Human Health and Social Work Activities", 1.0, 0.00),
+    ("Information and Communication", 1.0, 0.00),
+    ("Transportation and Storage", 1.0, 0.00),
+    ("Education", 1.0, 0.00),
+    ("Arts, Entertainment, and Recreation", 1.0, 0.00),
+    ("Manufacturing", 1.0, 0.00),
+    ("Accommodation and Food Service Activities", 1.0, 0.00),
+    ("Agriculture, Forestry, and Fishing", 1.0, 0.00),
+    ("Real Estate Activities", 1.0, 0.00),
+    ("Administrative and Support Service Activities", 1.0, 0.00),
+    ("Financial and Insurance Activities", 1.0, 0.00)
+)
+# Alternate spellings accepted for a sector, mapped to the canonical name in _INDUSTRY_TABLE.
+# Older callers send "Agriculture, Forestry and Fishing" (no serial comma); both score the same.
+INDUSTRY_SECTOR_ALIASES: Mapping[str, str] = MappingProxyType({
+    "Agriculture, Forestry and Fishing": "Agriculture, Forestry, and Fishing",
+})
+_INDUSTRY_TABLE += tuple(
+    (alias, risk, adjust)
+    for alias, canonical in INDUSTRY_SECTOR_ALIASES.items()
+    for name, risk, adjust in _INDUSTRY_TABLE
+    if name == canonical
+)
+ACCEPTABLE_INDUSTRY_SECTORS = frozenset(name for name, _, _ in _INDUSTRY_TABLE)
+ACCEPTABLE_INDUSTRY_RISK_SCORES = {name: risk for name, risk, _ in _INDUSTRY_TABLE}
+FAILED_INDUSTRY_SECTORS = frozenset({
     "Illicit or Illegal industries",
     "Places of Worship",
     "Places of Gambling",
     "Environmentally harmful industries",
     "Predatory financial services (e.g. payday lenders)"
-]
+})
 
 #---------------------------------------------------
 # Error Logging
 # --------------------------------------------------
-# Configure structured logging
-logging.basicConfig(
-    level=logging.INFO,  # You can adjust the log level (DEBUG, INFO, WARNING, ERROR)
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full instead of blocking."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes once its oldest buffered record is flush_interval seconds old."""
+
+    def __init__(self, capacity: int, flush_interval: float, flushLevel: int, target: logging.Handler) -> None:
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        # Called after the record is appended, so the buffer is never empty here
+        return super().shouldFlush(record) or record.created - self.buffer[0].created >= self.flush_interval
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its TimedMemoryHandler whenever the queue has been idle for the
+    handler's flush_interval, so buffered records never wait on later traffic to be written.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", handler: TimedMemoryHandler) -> None:
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.log_queue = log_queue
+        self.buffer = handler
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.log_queue.get(block=block, timeout=self.buffer.flush_interval)
+            except queue.Empty:
+                if not block:
+                    raise
+                # Idle for a whole interval, so everything still buffered is at least that old
+                self.buffer.flush()
+
+def init_logging(level: int = logging.INFO, buffer_capacity: int = 500, flush_interval: float = 0.05,
+                 queue_size: int = 10000) -> None:
+    """
+    Configure structured logging on the root logger.
+    Call this once from the application entrypoint (see main.py) rather than at import time,
+    so importing config does not install handlers behind the server's back.
+
+    Request threads only enqueue records (bounded at queue_size; overflow is dropped and counted
+    on the handler's `dropped` attribute). A background QueueListener thread hands them to a
+    TimedMemoryHandler that writes to stderr every buffer_capacity records or flush_interval
+    seconds, whichever comes first (immediately for ERROR and above, and on process exit).
+    Pass buffer_capacity=0 to write every record straight through. Pass queue_size=0 to log on
+    the calling thread; records are then written straight through, since no listener thread is
+    left to run the timed flush.
+
+    If the root logger already has handlers (e.g. installed by the web server), they are left
+    untouched and no listener thread is started.
+    """
+    if logging.getLogger().handlers:
+        return
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    handler: logging.Handler = stream
+    if queue_size > 0:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        if buffer_capacity > 0:
+            buffer = TimedMemoryHandler(buffer_capacity, flush_interval, flushLevel=logging.ERROR, target=stream)
+            listener: logging.handlers.QueueListener = FlushingQueueListener(log_queue, buffer)
+            atexit.register(buffer.flush)
+        else:
+            listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        listener.start()
+        # Registered after buffer.flush, so at exit the queue drains before the final flush
+        atexit.register(listener.stop)
+        handler = DroppingQueueHandler(log_queue)
+        # The queue only carries the rendered message; the stream formatter adds the prefix
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(
+        level=level,  # You can adjust the log level (DEBUG, INFO, WARNING, ERROR)
+        handlers=[handler]
+    )
+
 logger = logging.getLogger(__name__)
 
 class EvaluationError(Exception):
     """Custom exception for errors during loan evaluation."""
     pass
 
+# --------------------------------------------------
+# Decision Results
+# --------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Decision:
+    """Compact, immutable result of a single check (serialized by FastAPI like a dict)."""
+    decision: str
+    confidence: float
+    explanation: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A fresh, caller-owned dict copy (for results that get extra fields attached)."""
+        return {"decision": self.decision, "confidence": self.confidence, "explanation": self.explanation}
+
 # --------------------------------------------------
 # Confidence Configs
 # --------------------------------------------------
@@ -168,40 +312,23 @@ CONFIG = {"loan_adjustment_factor": 0.10}
 SME_CONFIDENCE_ADJUSTMENTS = {"EB": 0.10, "ESB": 0.00, "NTB": -0.15}
 RISK_CONFIDENCE_ADJUSTMENTS = {"T1": 0.10, "T2": 0.00, "T3": -0.15}
 DSCR_CONFIDENCE_ADJUSTMENTS = {"low": -0.15, "medium": 0.00, "high": 0.10}
-INDUSTRY_CONFIDENCE_ADJUSTMENTS = {
-    "Construction": 0.00,
-    "Professional, Scientific, and Technical Activities": 0.00,
-    "Wholesale and Retail Trade": 0.00,
-    "Other Service Activities": 0.00,
-    "Human Health and Social Work Activities": 0.00,
-    "Information and Communication": 0.00,
-    "Transportation and Storage": 0.00,
-    "Education": 0.00,
-    "Arts, Entertainment, and Recreation": 0.00,
-    "Manufacturing": 0.00,
-    "Accommodation and Food Service Activities": 0.00,
-    "Agriculture, Forestry and Fishing": 0.00,
-    "Real Estate Activities": 0.00,
-    "Administrative and Support Service Activities": 0.00,
-    "Financial and Insurance Activities": 0.00
+INDUSTRY_CONFIDENCE_ADJUSTMENTS = {name: adjust for name, _, adjust in _INDUSTRY_TABLE}
+
+# --------------------------------------------------
+# Key Interning
+# --------------------------------------------------
+# Canonical (interned) copies of the categorical keys. Request values are swapped for these
+# at the API boundary so the dict lookups above hit CPython's identity fast path instead of
+# a full string compare. Unknown values are passed through untouched (never interned).
+_INTERNED_KEYS = {
+    key: sys.intern(key)
+    for key in (*SME_PROFILES, *RISK_PROFILES, *DSCR_CONFIDENCE_ADJUSTMENTS,
+                *ACCEPTABLE_INDUSTRY_SECTORS, "secured", "unsecured")
 }
 
-def adjust_confidence(sme_profile: str, requested_loan: float, min_loan: float, max_loan: float,
-                      risk_profile: str, dscr_level: str, industry_sector: str) -> float:
-    
-    base_confidence = SME_PROFILES.get(sme_profile, {}).get("confidence", 0.75)
-    sme_adjust = SME_CONFIDENCE_ADJUSTMENTS.get(sme_profile, 0.0)
-    base_confidence += sme_adjust
-
-    factor = CONFIG["loan_adjustment_factor"]
-    denominator = max_loan - min_loan if max_loan != min_loan else 1
-    reduction = ((requested_loan - min_loan) / denominator) * factor
-    loan_conf = max(base_confidence - reduction, 0.50)
-    risk_conf = loan_conf + RISK_CONFIDENCE_ADJUSTMENTS.get(risk_profile, 0)
-    final_conf = risk_conf + DSCR_CONFIDENCE_ADJUSTMENTS.get(dscr_level, 0)
-    industry_adjust = INDUSTRY_CONFIDENCE_ADJUSTMENTS.get(industry_sector, 0)
-    final_conf += industry_adjust
-    return max(min(final_conf, 1.00), 0.50)
+def intern_key(value: str) -> str:
+    """Returns the canonical interned copy of a known categorical key, or the value unchanged."""
+    return _INTERNED_KEYS.get(value, value)
 
 # --------------------------------------------------
 # Risk Curve Configs
@@ -231,46 +358,13 @@ CREDIT_RISK_SCORES = {
 
 # Risk scores for Industry Sectors (for acceptable sectors)
 # You might want to set different scores here from the confidence adjustments.
-INDUSTRY_RISK_SCORES = {
-    "Construction": 1.0,
-    "Professional, Scientific, and Technical Activities": 1.0,
-    "Wholesale and Retail Trade": 1.0,
-    "Other Service Activities": 1.0,
-    "Human Health and Social Work Activities": 1.0,
-    "Information and Communication": 1.0,
-    "Transportation and Storage": 1.0,
-    "Education": 1.0,
-    "Arts, Entertainment, and Recreation": 1.0,
-    "Manufacturing": 1.0,
-    "Accommodation and Food Service Activities": 1.0,
-    "Agriculture, Forestry and Fishing": 1.0,
-    "Real Estate Activities": 1.0,
-    "Administrative and Support Service Activities": 1.0,
-    "Financial and Insurance Activities": 1.0
-}      
+INDUSTRY_RISK_SCORES = {name: risk for name, risk, _ in _INDUSTRY_TABLE}
 # Define weights for each risk factor (they should add up to 1.0 if you want a normalized score)
 WEIGHT_SME = 0.32
 WEIGHT_DSCR = 0.32
 WEIGHT_CREDIT = 0.32
 WEIGHT_INDUSTRY = 0.04
 
-def calculate_overall_risk(sme_profile: str, dscr_level: str, credit_profile: str, industry_sector: str) -> float:
-    """
-    Calculates an overall risk score by applying weights to the risk scores of each factor.
-    Lower overall scores indicate lower risk.
-    """
-    # Retrieve individual risk scores (using default values if a key isn't found)
-    sme_score = SME_RISK_SCORES.get(sme_profile, 2.0)
-    dscr_score = DSCR_RISK_SCORES.get(dscr_level, 2.0)
-    credit_score = CREDIT_RISK_SCORES.get(credit_profile, 2.0)
-    industry_score = INDUSTRY_RISK_SCORES.get(industry_sector, 2.0)
-    
-    overall_risk = (WEIGHT_SME * sme_score +
-                    WEIGHT_DSCR * dscr_score +
-                    WEIGHT_CREDIT * credit_score +
-                    WEIGHT_INDUSTRY * industry_score)
-    return overall_risk
-
 # -------------------------------------------------------------------
 # Global Checks and Borrower Types   
 # -------------------------------------------------------------------
@@ -278,43 +372,63 @@ def calculate_overall_risk(sme_profile: str, dscr_level: str, credit_profile: st
 MIN_DSCR = 1.25
 MIN_LOAN_AMOUNT = 25001
 
-def evaluate_borrower_type(borrower_type: str) -> dict:
-    allowed = {"LTD", "Sole Trader", "LLP"}
-    if borrower_type in allowed:
-        return {
-            "decision": DECISIONS["PROGRESS"]["value"],
-            "confidence": 0.95,
-            "explanation": f"Borrower type {borrower_type} is accepted."
-        }
-    return {
-        "decision": DECISIONS["FAIL"]["value"],
-        "confidence": 0.99,
-        "explanation": f"Borrower type {borrower_type} is not allowed."
-    }
+# Accepted borrower types and their (shared) responses
+_BORROWER_TYPE_RESPONSES = {
+    borrower_type: Decision(DECISIONS["PROGRESS"]["value"], 0.95, f"Borrower type {borrower_type} is accepted.")
+    for borrower_type in ("LTD", "Sole Trader", "LLP")
+}
+
+def evaluate_borrower_type(borrower_type: str) -> Decision:
+    accepted = _BORROWER_TYPE_RESPONSES.get(borrower_type)
+    if accepted is not None:
+        return accepted
+    return _rejected_borrower_type(borrower_type)
+
+# Outcomes for unlisted inputs are built on first sight and then shared like the constants
+# (Decision is frozen); maxsize bounds what arbitrary client strings can pin in memory.
+@lru_cache(maxsize=256)
+def _rejected_borrower_type(borrower_type: str) -> Decision:
+    return Decision(DECISIONS["FAIL"]["value"], 0.99, f"Borrower type {borrower_type} is not allowed.")
+
+@lru_cache(maxsize=256)
+def _unrecognized_industry(industry_sector: str) -> Decision:
+    return Decision(DECISIONS["FLAG_UW"]["value"], 0.99, f"Industry sector '{industry_sector}' is not recognized.")
 
-def global_sme_checks(dscr: float, loan_amount: float, risk_profile: str, sme_profile: str, industry_sector: str) -> dict:
+# Constant global check outcomes, built once rather than on every declined application
+_MSG_DSCR_FAIL = f"DSCR < {MIN_DSCR * 100:.0f}%. Loan declined."
+_MSG_LOAN_MIN_FAIL = f"Loan amount below £{MIN_LOAN_AMOUNT}. Does not meet minimum threshold."
+_FAIL_DSCR = Decision(DECISIONS["FAIL"]["value"], 0.99, _MSG_DSCR_FAIL)
+_FAIL_LOAN_MIN = Decision(DECISIONS["FAIL"]["value"], 0.99, _MSG_LOAN_MIN_FAIL)
+_FAIL_T3 = Decision(DECISIONS["FAIL"]["value"], 0.99, "T3 risk profiles do not meet the minimum credit profile threshold.")
+_FAIL_SU = Decision(DECISIONS["FAIL"]["value"], 0.99, "Startups are not considered for the Happy Path.")
+_FAIL_INDUSTRY = {
+    industry: Decision(DECISIONS["FAIL"]["value"], 0.99, f"Industry sector '{industry}' is not accepted.")
+    for industry in FAILED_INDUSTRY_SECTORS
+}
+
+def global_sme_checks(dscr: float, loan_amount: float, risk_profile: str, sme_profile: str, industry_sector: str) -> Optional[Decision]:
+    """
+    Runs the global hard-stop checks in order and returns the first failing outcome, or None if all pass.
+    """
     if dscr < MIN_DSCR:
-        return {"decision": DECISIONS["FAIL"]["value"], "confidence": 0.99, "explanation": f"DSCR < {MIN_DSCR * 100:.0f}%. Loan declined."}
+        return _FAIL_DSCR
     if loan_amount < MIN_LOAN_AMOUNT:
-        return {"decision": DECISIONS["FAIL"]["value"], "confidence": 0.99, "explanation": f"Loan amount below £{MIN_LOAN_AMOUNT}. Does not meet minimum threshold."}
+        return _FAIL_LOAN_MIN
     if risk_profile == "T3":
-        return {"decision": DECISIONS["FAIL"]["value"], "confidence": 0.99, "explanation": "T3 risk profiles do not meet the minimum credit profile threshold."}
+        return _FAIL_T3
     if sme_profile == "SU":
-        return {"decision": DECISIONS["FAIL"]["value"], "confidence": 0.99, "explanation": "Startups are not considered for the Happy Path."}
-    if industry_sector in FAILED_INDUSTRY_SECTORS:
-        return {"decision": DECISIONS["FAIL"]["value"],
-                "confidence": 0.99,
-                "explanation": f"Industry sector '{industry_sector}' is not accepted."}
+        return _FAIL_SU
+    failed_industry = _FAIL_INDUSTRY.get(industry_sector)
+    if failed_industry is not None:
+        return failed_industry
     if industry_sector not in ACCEPTABLE_INDUSTRY_SECTORS:
-        return {"decision": DECISIONS["FLAG/UW"]["value"],
-                "confidence": 0.99,
-                "explanation": f"Industry sector '{industry_sector}' is not recognized."}
-    return {}
+        return _unrecognized_industry(industry_sector)
+    return None
 
 # -------------------------------------------------------------------
 # Conditions Checklist
 # -------------------------------------------------------------------
-REQUIRED_DOCUMENTS = {
+REQUIRED_DOCUMENTS: Mapping[str, Any] = {
     "common": {
         "Completed Application Form": "Must capture the loan request, purpose, trading history, and full details of the borrower and directors—including both personal and business assets/liabilities and a declaration of credit history.",
         "Proof of Identity": "For all business owners, directors, and persons with significant control. Acceptable forms include: Passport, Driving license, National identity card, or other government-issued photo ID.",
@@ -339,12 +453,19 @@ REQUIRED_DOCUMENTS = {
         "Financial Statements": "3 years of projections."
     }
 }
+REQUIRED_DOCUMENTS = freeze(REQUIRED_DOCUMENTS)
+
+# Common documents merged with each SME profile's own requirements, built once at import
+REQUIRED_DOCUMENTS_BY_SME = MappingProxyType({
+    sme: MappingProxyType({**REQUIRED_DOCUMENTS["common"], **REQUIRED_DOCUMENTS[sme]})
+    for sme in ("EB", "ESB", "NTB", "SU")
+})
 
 # Personal Guarantee (PG) Definitions
 PG_BASE_PERCENTAGE = 0.20  # Base PG requirement for the lowest risk borrowers
 PG_MAX_PERCENTAGE = 1.00   # Maximum PG requirement for the highest risk borrowers
 
-CONDITIONS_CHECKLIST = {
+CONDITIONS_CHECKLIST: Mapping[str, Any] = {
     "Required Conditions": {
         "Personal Guarantee": {
             "description": "A personal guarantee is required for all applications except for Sole Traders.",
@@ -365,24 +486,25 @@ CONDITIONS_CHECKLIST = {
         }
     }
 }
+CONDITIONS_CHECKLIST = freeze(CONDITIONS_CHECKLIST)
 
 # -------------------------------------------------------------------
 # PG Scaling
 # -------------------------------------------------------------------
-def determine_pg_percentage(overall_risk: float) -> float:
-    # Define the risk range (calibrate these values as needed)
-    min_risk = 1.0
-    max_risk = 2.0
-
-    # Base PG for lowest risk
-    base_pg = 0.20  # 20%
-    # Maximum PG you might require for the highest risk
-    max_pg = 1.00   # 100%
-    
-    # Normalize the risk score between 0 and 1
-    normalized_risk = (overall_risk - min_risk) / (max_risk - min_risk)
-    
-    # Linearly interpolate between base and max PG percentages
-    pg_percentage = base_pg + normalized_risk * (max_pg - base_pg)
-    
-    return pg_percentage
+# Define the risk range (calibrate these values as needed)
+PG_MIN_RISK = 1.0
+PG_MAX_RISK = 2.0
+
+# -------------------------------------------------------------------
+# Scoring re-exports
+# -------------------------------------------------------------------
+# adjust_confidence, calculate_overall_risk and determine_pg_percentage moved to scoring.py; they
+# stay importable from config for existing callers. Resolved on first access because scoring
+# itself imports from config.
+_SCORING_EXPORTS = frozenset({"adjust_confidence", "calculate_overall_risk", "determine_pg_percentage"})
+
+def __getattr__(name: str) -> Any:
+    if name in _SCORING_EXPORTS:
+        import scoring
+        return getattr(scoring, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,33 @@
 import os
-import openai
+from functools import lru_cache
+from typing import Any, Dict, List
+from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv() # Loads variables from your .env file
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+GPT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-def call_gpt(prompt: str) -> str:
-    response = openai.Completion.create(
-        engine="text-davinci-003",
-        prompt=prompt,
-        max_tokens=300,
+@lru_cache(maxsize=1)
+def _client() -> OpenAI:
+    # One shared client, created on first use, so every call reuses its pooled keep-alive
+    # connections instead of paying a new TLS handshake
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def call_gpt(prompt: str, max_tokens: int = 300, json_mode: bool = False) -> str:
+    return call_gpt_choices(prompt, 1, max_tokens, json_mode)[0]
+
+def call_gpt_choices(prompt: str, n: int, max_tokens: int = 300, json_mode: bool = False) -> List[str]:
+    """
+    Returns n independent completions of the prompt from a single request.
+    With json_mode, the model is constrained to reply with a single JSON object.
+    """
+    extra: Dict[str, Any] = {"response_format": {"type": "json_object"}} if json_mode else {}
+    response = _client().chat.completions.create(
+        model=GPT_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        n=n,
+        **extra,
     )
-    return response.choices[0].text.strip()
\ No newline at end of file
+    return [(choice.message.content or "").strip() for choice in response.choices]
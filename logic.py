@@ -1,297 +1,299 @@
-import os
 import logging
-import copy
-from datetime import datetime
-from pydantic import BaseModel
-from typing import List
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, cast
 from config import (
     DECISIONS,
     MIN_DSCR,
     MIN_LOAN_AMOUNT,
     REQUIRED_DOCUMENTS,
+    REQUIRED_DOCUMENTS_BY_SME
+)
+from scoring import (
     calculate_overall_risk,
     determine_pg_percentage
 )
-from config import adjust_confidence
 from config import evaluate_borrower_type
-from config import SME_PROFILES  # for base confidence
-from config import EvaluationError
-import logging
+from config import SME_LOAN_BANDS  # borrowing limits
+from config import Decision, EvaluationError
 
 logger = logging.getLogger(__name__)
 
+# The decision driver is fully annotated (clean under mypy --strict) and compiles with mypyc
+# together with the scoring kernels (no source changes, the plain-Python modules are used when no
+# build is present):
+#     mypyc logic.py scoring.py
+# Compiled code coerces int arguments to float-annotated parameters, so the public entry points
+# coerce dscr and loan_amount themselves; both builds then render amounts the same way ("£1000.0").
+
 # --------------------------------------------------
 # Business Logic (i.e. Rules)
 # --------------------------------------------------
 
 # Below is a simplified version of the business logic which is categorized by SME profile
 
+# Decision outcome values, resolved once. Every decision built here shares these exact string
+# objects, so outcome comparisons short-circuit on identity inside str.__eq__.
+_PROGRESS = DECISIONS["PROGRESS"]["value"]
+_CONDITIONAL_PASS = DECISIONS["CONDITIONAL_PASS"]["value"]
+_FAIL = DECISIONS["FAIL"]["value"]
+
 # --------------------------------------------------
-# EB Evaluations
+# Compiled Rule Table
 # --------------------------------------------------
-def evaluate_eb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> dict:
+# The risk-profile rules are declared once here and compiled at import, both into a lookup keyed
+# by (sme_profile, risk_profile, dscr_band, loan_type) and into a generated matcher function
+# with the rule constants inlined, which is what the per-request path runs.
+#
+# (sme_profile, risk_profile, loan_type, min_dscr, dscr_inclusive, max_amount, confidence, explanation)
+_Rule = Tuple[str, str, str, float, bool, int, float, str]
+# (max_amount, decision, log label) for a matched rule
+_RuleEntry = Tuple[int, Decision, str]
+_RuleMatcher = Callable[[str, str, float, float, str], Optional[_RuleEntry]]
+
+_RISK_RULES: Tuple[_Rule, ...] = (
+    ("EB", "T1", "unsecured", 1.25, True, 150000, 0.87, "EB/T1 with DSCR >125% qualifies for an unsecured loan up to £150,000."),
+    ("EB", "T1", "secured", 1.25, True, 250000, 0.89, "EB/T1 with DSCR >150% qualifies for a secured loan."),
+    ("EB", "T2", "unsecured", 1.25, True, 150000, 0.77, "EB/T2 with DSCR >125% qualifies for an unsecured loan up to £150,000."),
+    ("EB", "T2", "secured", 1.25, True, 250000, 0.89, "EB/T2 with DSCR >150% qualifies for a secured loan."),
+    ("ESB", "T1", "unsecured", 1.25, True, 80000, 0.88, "ESB/T1 with DSCR >125% qualifies for an unsecured loan."),
+    ("ESB", "T1", "secured", 1.25, True, 150000, 0.88, "ESB/T1 with DSCR >125% qualifies for a secured loan."),
+    ("ESB", "T2", "unsecured", 1.25, True, 80000, 0.88, "ESB/T2 with DSCR >125% qualifies for an unsecured loan."),
+    ("ESB", "T2", "secured", 1.25, True, 150000, 0.88, "ESB/T2 with DSCR >125% qualifies for a secured loan."),
+    ("NTB", "T1", "unsecured", 1.25, True, 60000, 0.80, "NTB/T1 with DSCR >125% qualifies for an unsecured loan."),
+    ("NTB", "T1", "secured", 1.25, False, 100000, 0.85, "NTB/T1 with DSCR >150% qualifies for a secured loan."),
+    ("NTB", "T2", "unsecured", 1.25, True, 60000, 0.80, "NTB/T2 with DSCR >125% qualifies for an unsecured loan."),
+    ("NTB", "T2", "secured", 1.25, False, 100000, 0.85, "NTB/T2 with DSCR >150% qualifies for a secured loan."),
+)
+
+def _rule_floor(min_dscr: float, inclusive: bool) -> float:
+    # Smallest DSCR a rule accepts: ">= t" starts at t, "> t" at the next float after t
+    return min_dscr if inclusive else math.nextafter(min_dscr, math.inf)
+
+# DSCR band edges, one per distinct rule floor, so every rule starts exactly on a band boundary.
+# With the current rules: below 1.25 / exactly 1.25 / above 1.25 (the next float after 1.25 splits
+# ">= 1.25" from "> 1.25" rules).
+_DSCR_EDGES = tuple(sorted({_rule_floor(rule[3], rule[4]) for rule in _RISK_RULES}))
+
+def _dscr_band(dscr: float) -> int:
+    # NaN compares false against every threshold, so it belongs below the floor (band 0)
+    return bisect_right(_DSCR_EDGES, dscr) if dscr == dscr else 0
+
+def _rule_entry(rule: _Rule) -> _RuleEntry:
+    sme, risk, loan_type, min_dscr, inclusive, max_amount, confidence, explanation = rule
+    return (
+        max_amount,
+        Decision(_PROGRESS, confidence, explanation),
+        f"{sme} Evaluation ({risk}, {loan_type})"
+    )
+
+def _compile_rules(rules: Sequence[_Rule],
+                   entries: Sequence[_RuleEntry]) -> Dict[Tuple[str, str, int, str], _RuleEntry]:
+    table: Dict[Tuple[str, str, int, str], _RuleEntry] = {}
+    for (sme, risk, loan_type, min_dscr, inclusive, *_), entry in zip(rules, entries):
+        floor = _rule_floor(min_dscr, inclusive)
+        # A floor between edges would be widened to the band below it, silently disagreeing with
+        # the generated matcher
+        if floor not in _DSCR_EDGES:
+            raise ValueError(f"DSCR threshold {min_dscr} of the {sme}/{risk} {loan_type} rule is not a band edge")
+        first_band = bisect_right(_DSCR_EDGES, floor)
+        for band in range(first_band, len(_DSCR_EDGES) + 1):
+            key = (sme, risk, band, loan_type)
+            # Rules must not overlap: the generated matcher takes the first hit, the table the last
+            if key in table:
+                raise ValueError(f"Overlapping risk rules for {sme}/{risk} {loan_type} loans")
+            table[key] = entry
+    return table
+
+def _generate_matcher(rules: Sequence[_Rule], entries: Sequence[_RuleEntry]) -> _RuleMatcher:
     """
-    Evaluate the loan eligibility for an Established Business (EB) SME.
-    This version enforces all hardcoded numeric limits (minimum and maximum borrowing limits)
-    before processing DSCR and risk profile conditions.
+    Generates a matcher with the rule tree inlined as nested ifs on constants
+    (sme -> risk -> loan_type -> dscr/amount) and compiles it, so a lookup does no hashing,
+    bisecting or tuple unpacking. Returns the matching rule's (max_amount, decision, label)
+    entry, or None.
     """
-    if sme_profile != "EB":
-        error_msg = f"evaluate_eb_risk can only evaluate EB profiles. Received: {sme_profile}"
-        logger.error(error_msg)
-        raise EvaluationError(error_msg)
+    tree: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+    for index, rule in enumerate(rules):
+        sme, risk, loan_type = rule[:3]
+        tree.setdefault(sme, {}).setdefault(risk, {}).setdefault(loan_type, []).append(index)
 
-    # Enforce hardcoded borrowing limits for EB
-    if loan_type.lower() == "secured":
-        min_limit = SME_PROFILES["EB"]["loan_secured"]["min"]
-        max_limit = SME_PROFILES["EB"]["loan_secured"]["max"]
-    else:
-        min_limit = SME_PROFILES["EB"]["loan_unsecured"]["min"]
-        max_limit = SME_PROFILES["EB"]["loan_unsecured"]["max"]
-     
-    # Check against the minimum allowed DSCR
-    if dscr < MIN_DSCR:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"DSCR of {dscr} is below the minimum allowed DSCR of {MIN_DSCR}. Loan declined."
-        }
-        logger.info(f"EB Evaluation DSCR hard stop: {decision}")
-        return decision
+    lines = ["def _match(sme_profile, risk_profile, dscr, loan_amount, loan_type):"]
+    for sme, risks in tree.items():
+        lines.append(f"    if sme_profile == {sme!r}:")
+        for risk, loan_types in risks.items():
+            lines.append(f"        if risk_profile == {risk!r}:")
+            for loan_type, indexes in loan_types.items():
+                lines.append(f"            if loan_type == {loan_type!r}:")
+                for index in indexes:
+                    _, _, _, min_dscr, inclusive, max_amount, _, _ = rules[index]
+                    op = ">=" if inclusive else ">"
+                    # Positive tests, so NaN DSCR / amount never match
+                    lines.append(f"                if dscr {op} {min_dscr!r} and loan_amount <= {max_amount!r}:")
+                    lines.append(f"                    return _ENTRY_{index}")
+                lines.append("                return None")
+            lines.append("            return None")
+        lines.append("        return None")
+    lines.append("    return None")
 
-    # Check against the minimum allowed loan amount
-    if loan_amount < min_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"Loan amount £{loan_amount} is below the minimum allowed limit of £{min_limit} for EB {loan_type} loans."
-        }
-        logger.info(f"EB Evaluation hard stop (min limit): {decision}")
-        return decision
+    namespace: Dict[str, Any] = {f"_ENTRY_{index}": entry for index, entry in enumerate(entries)}
+    exec(compile("\n".join(lines), "<risk-rules>", "exec"), namespace)
+    return cast(_RuleMatcher, namespace["_match"])
 
-    # Check against the maximum allowed loan amount
-    if loan_amount > max_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"Loan amount £{loan_amount} exceeds the maximum allowed limit of £{max_limit} for EB {loan_type} loans."
-        }
-        logger.info(f"EB Evaluation hard stop (max limit): {decision}")
-        return decision
-    base_conf = SME_PROFILES["EB"]["confidence"]
-    if risk_profile == "T1" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 150000:
-            decision = {"decision": "PROGRESS", "confidence": 0.87,
-                        "explanation": "EB/T1 with DSCR >125% qualifies for an unsecured loan up to £150,000."}
-            logger.info(f"EB Evaluation (T1, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and loan_amount <= 250000:
-            decision = {"decision": "PROGRESS", "confidence": 0.89,
-                        "explanation": "EB/T1 with DSCR >150% qualifies for a secured loan."}
-            logger.info(f"EB Evaluation (T1, secured): {decision}")
-            return decision
-    if risk_profile == "T2" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 150000:
-            decision = {"decision": "PROGRESS", "confidence": 0.77,
-                        "explanation": "EB/T2 with DSCR >125% qualifies for an unsecured loan up to £150,000."}
-            logger.info(f"EB Evaluation (T2, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and loan_amount <= 250000:
-            decision = {"decision": "PROGRESS", "confidence": 0.89,
-                        "explanation": "EB/T2 with DSCR >150% qualifies for a secured loan."}
-            logger.info(f"EB Evaluation (T2, secured): {decision}")
-            return decision
+# Built once at import; rebuild both if _RISK_RULES changes at runtime
+_RULE_ENTRIES = tuple(_rule_entry(rule) for rule in _RISK_RULES)
+_RULE_TABLE = _compile_rules(_RISK_RULES, _RULE_ENTRIES)  # dense form, used by batch.py
+_match_compiled = _generate_matcher(_RISK_RULES, _RULE_ENTRIES)
 
 # --------------------------------------------------
-# ESB Evaluations
+# Hard-Stop Results
 # --------------------------------------------------
-def evaluate_esb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> dict:
+def _hard_fail(explanation: str) -> Dict[str, Any]:
+    # Caller-owned FAIL result for evaluate_application's own checks
+    return Decision(_FAIL, 0.99, explanation).to_dict()
+
+# Explanations for evaluate_application's own checks (shared with the batch endpoint)
+def _dscr_floor_explanation(dscr: float) -> str:
+    return f"DSCR of {dscr} is below the minimum threshold of {MIN_DSCR}. Loan declined."
+
+def _min_amount_explanation(loan_amount: float) -> str:
+    return f"Loan amount £{loan_amount} is below the minimum threshold of £{MIN_LOAN_AMOUNT}."
+
+def _unsupported_profile_explanation(sme_profile: str) -> str:
+    return f"SME profile '{sme_profile}' is not supported for the Happy Path."
+
+# Evaluator hard-stop FAILs are built once per distinct input and shared (Decision is frozen); callers that
+# need to amend a decision (evaluate_application) take their own copy. typed=True keeps 100 and
+# 100.0 apart, since they format differently in the explanation.
+@lru_cache(maxsize=1024, typed=True)
+def _dscr_fail(dscr: float) -> Decision:
+    return Decision(_FAIL, 0.99, f"DSCR of {dscr} is below the minimum allowed DSCR of {MIN_DSCR}. Loan declined.")
+
+@lru_cache(maxsize=1024, typed=True)
+def _limit_fail(sme_profile: str, loan_type: str, bound: str, limit: float, loan_amount: float) -> Decision:
+    if bound == "min":
+        reason = f"is below the minimum allowed limit of £{limit}"
+    else:
+        reason = f"exceeds the maximum allowed limit of £{limit}"
+    return Decision(_FAIL, 0.99, f"Loan amount £{loan_amount} {reason} for {sme_profile} {loan_type} loans.")
+
+# --------------------------------------------------
+# SME Risk Evaluation
+# --------------------------------------------------
+# SME profiles with risk-profile rules; anything else fails in evaluate_application
+EVALUATED_SME_PROFILES = frozenset({"EB", "ESB", "NTB"})
+
+# Log line for each outcome: (format, subject); the decision is always the last argument
+_LOG_DSCR_STOP = "%s Evaluation DSCR hard stop: %s"
+_LOG_MIN_STOP = "%s Evaluation hard stop (min limit): %s"
+_LOG_MAX_STOP = "%s Evaluation hard stop (max limit): %s"
+_LOG_RULE = "%s: %s"
+_NO_MATCH: Tuple[Optional[Decision], str, str] = (None, "", "")
+
+@lru_cache(maxsize=4096, typed=True)
+def _evaluate_sme_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float,
+                       loan_type: str) -> Tuple[Optional[Decision], str, str]:
     """
-    Evaluate the loan eligibility for an Early-Stage Business (ESB) SME.
-    This version enforces all hardcoded numeric limits (minimum and maximum borrowing limits)
-    before processing DSCR and risk profile conditions.
+    Pure part of evaluate_sme_risk, memoized on the exact inputs. Returns the shared Decision
+    (or None) together with the log format and subject for it.
     """
-    if sme_profile != "ESB":
-        error_msg = f"evaluate_esb_risk can only evaluate ESB profiles. Received: {sme_profile}"
-        logger.error(error_msg)
-        raise EvaluationError(error_msg)
-
     # Check against the minimum allowed DSCR
     if dscr < MIN_DSCR:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"DSCR of {dscr} is below the minimum allowed DSCR of {MIN_DSCR}. Loan declined."
-        }
-        logger.info(f"ESB Evaluation DSCR hard stop: {decision}")
-        return decision
+        return _dscr_fail(dscr), _LOG_DSCR_STOP, sme_profile
 
     # Enforce hardcoded borrowing limits from the SME_PROFILES configuration.
     # Both minimum and maximum limits must be met.
-    if loan_type.lower() == "secured":
-        min_limit = SME_PROFILES["ESB"]["loan_secured"]["min"]
-        max_limit = SME_PROFILES["ESB"]["loan_secured"]["max"]
-    else:
-        min_limit = SME_PROFILES["ESB"]["loan_unsecured"]["min"]
-        max_limit = SME_PROFILES["ESB"]["loan_unsecured"]["max"]
-
-    # Check against the minimum allowed loan amount
-    if loan_amount < min_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": (f"Loan amount £{loan_amount} is below the minimum allowed limit of £{min_limit} "
-                            f"for ESB {loan_type} loans.")
-        }
-        logger.info(f"ESB Evaluation hard stop (min limit): {decision}")
-        return decision
+    limits = SME_LOAN_BANDS.get((sme_profile, loan_type))
+    if limits is None:
+        # loan_type arrives lower-cased from the API; direct callers may pass any case, and
+        # anything other than "secured" gets the unsecured limits
+        limits = SME_LOAN_BANDS[(sme_profile, "secured" if loan_type.lower() == "secured" else "unsecured")]
 
-    # Check against the maximum allowed loan amount
-    if loan_amount > max_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": (f"Loan amount £{loan_amount} exceeds the maximum allowed limit of £{max_limit} "
-                            f"for ESB {loan_type} loans.")
-        }
-        logger.info(f"ESB Evaluation hard stop (max limit): {decision}")
-        return decision
+    # One chained comparison on the common in-range path; which side failed is only worked out
+    # once the amount is known to be outside the limits
+    if not limits.min <= loan_amount <= limits.max:
+        if loan_amount < limits.min:
+            return _limit_fail(sme_profile, loan_type, "min", limits.min, loan_amount), _LOG_MIN_STOP, sme_profile
+        if loan_amount > limits.max:
+            return _limit_fail(sme_profile, loan_type, "max", limits.max, loan_amount), _LOG_MAX_STOP, sme_profile
+        # Neither (NaN): fall through to the rules, which never match it
 
-    base_conf = SME_PROFILES["ESB"]["confidence"]
-    if risk_profile == "T1" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 80000:
-            decision = {"decision": "PROGRESS", "confidence": 0.88,
-                        "explanation": "ESB/T1 with DSCR >125% qualifies for an unsecured loan."}
-            logger.info(f"ESB Evaluation (T1, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and loan_amount <= 150000:
-            decision = {"decision": "PROGRESS", "confidence": 0.88,
-                        "explanation": "ESB/T1 with DSCR >125% qualifies for a secured loan."}
-            logger.info(f"ESB Evaluation (T1, secured): {decision}")
-            return decision
-    if risk_profile == "T2" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 80000:
-            decision = {"decision": "PROGRESS", "confidence": 0.88,
-                        "explanation": "ESB/T2 with DSCR >125% qualifies for an unsecured loan."}
-            logger.info(f"ESB Evaluation (T1, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and loan_amount <= 150000:
-            decision = {"decision": "PROGRESS", "confidence": 0.88,
-                        "explanation": "ESB/T2 with DSCR >125% qualifies for a secured loan."}
-            logger.info(f"ESB Evaluation (T2, secured): {decision}")
-            return decision
+    # Risk-profile rules; None if no rule applies (same as falling off the end of the old if-ladders)
+    entry = _match_compiled(sme_profile, risk_profile, dscr, loan_amount, loan_type)
+    if entry is None:
+        return _NO_MATCH
+    _, decision, label = entry
+    return decision, _LOG_RULE, label
 
-# --------------------------------------------------
-# NTB Evaluations
-# --------------------------------------------------
-def evaluate_ntb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> dict:
+def evaluate_sme_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> Optional[Decision]:
     """
-    Evaluate the loan eligibility for a Newly Trading Business (NTB) SME.
-    This version enforces all hardcoded numeric limits (minimum and maximum borrowing limits)
-    before processing DSCR and risk profile conditions.
+    Evaluate the loan eligibility for an EB, ESB or NTB SME.
+    Enforces the minimum DSCR and the SME's borrowing limits (from SME_PROFILES) before matching
+    the compiled risk-profile rules.
+
+    Results are shared, immutable Decisions memoized on the exact inputs (see _evaluate_sme_risk.cache_info());
+    the decision is still logged on every call.
     """
-    if sme_profile != "NTB":
-        error_msg = f"evaluate_ntb_risk can only evaluate NTB profiles. Received: {sme_profile}"
+    if sme_profile not in EVALUATED_SME_PROFILES:
+        error_msg = f"evaluate_sme_risk can only evaluate EB, ESB or NTB profiles. Received: {sme_profile}"
         logger.error(error_msg)
         raise EvaluationError(error_msg)
 
-    # Check against the minimum allowed DSCR
-    if dscr < MIN_DSCR:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"DSCR of {dscr} is below the minimum allowed DSCR of {MIN_DSCR}. Loan declined."
-        }
-        logger.info(f"NTB Evaluation DSCR hard stop: {decision}")
-        return decision
+    decision, log_format, subject = _evaluate_sme_risk(sme_profile, risk_profile, float(dscr), float(loan_amount),
+                                                       loan_type)
+    # Guarded so deployments running above INFO skip the logging call frame on the hot path
+    if decision is not None and logger.isEnabledFor(logging.INFO):
+        logger.info(log_format, subject, decision)
+    return decision
 
-    # Enforce hardcoded borrowing limits for NTB
-    if loan_type.lower() == "secured":
-        min_limit = SME_PROFILES["NTB"]["loan_secured"]["min"]
-        max_limit = SME_PROFILES["NTB"]["loan_secured"]["max"]
-    else:
-        min_limit = SME_PROFILES["NTB"]["loan_unsecured"]["min"]
-        max_limit = SME_PROFILES["NTB"]["loan_unsecured"]["max"]
-
-    # Check against the minimum allowed loan amount
-    if loan_amount < min_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"Loan amount £{loan_amount} is below the minimum allowed limit of £{min_limit} for NTB {loan_type} loans."
-        }
-        logger.info(f"NTB Evaluation hard stop (min limit): {decision}")
-        return decision
+def _require_profile(func_name: str, expected: str, sme_profile: str) -> None:
+    if sme_profile != expected:
+        error_msg = f"{func_name} can only evaluate {expected} profiles. Received: {sme_profile}"
+        logger.error(error_msg)
+        raise EvaluationError(error_msg)
 
-    # Check against the maximum allowed loan amount
-    if loan_amount > max_limit:
-        decision = {
-            "decision": "FAIL",
-            "confidence": 0.99,
-            "explanation": f"Loan amount £{loan_amount} exceeds the maximum allowed limit of £{max_limit} for NTB {loan_type} loans."
-        }
-        logger.info(f"NTB Evaluation hard stop (max limit): {decision}")
-        return decision
+# Per-profile entry points kept for existing callers
+def evaluate_eb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> Optional[Decision]:
+    _require_profile("evaluate_eb_risk", "EB", sme_profile)
+    return evaluate_sme_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
+
+def evaluate_esb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> Optional[Decision]:
+    _require_profile("evaluate_esb_risk", "ESB", sme_profile)
+    return evaluate_sme_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
 
-    base_conf = SME_PROFILES["NTB"]["confidence"]    
-    if risk_profile == "T1" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 60000:
-            decision = {
-                "decision": "PROGRESS",
-                "confidence": 0.80,
-                "explanation": "NTB/T1 with DSCR >125% qualifies for an unsecured loan."
-            }
-            logger.info(f"NTB Evaluation (T1, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and dscr > 1.25 and loan_amount <= 100000:
-            decision = {
-                "decision": "PROGRESS",
-                "confidence": 0.85,
-                "explanation": "NTB/T1 with DSCR >150% qualifies for a secured loan."
-            }
-            logger.info(f"NTB Evaluation (T1, secured): {decision}")
-            return decision
-    if risk_profile == "T2" and dscr >= 1.25:
-        if loan_type == "unsecured" and loan_amount <= 60000:
-            decision = {
-                "decision": "PROGRESS",
-                "confidence": 0.80,
-                "explanation": "NTB/T2 with DSCR >125% qualifies for an unsecured loan."
-            }
-            logger.info(f"NTB Evaluation (T2, unsecured): {decision}")
-            return decision
-        if loan_type == "secured" and dscr > 1.25 and loan_amount <= 100000:
-            decision = {
-                "decision": "PROGRESS",
-                "confidence": 0.85,
-                "explanation": "NTB/T2 with DSCR >150% qualifies for a secured loan."
-            }
-            logger.info(f"NTB Evaluation (T2, secured): {decision}")
-            return decision
+def evaluate_ntb_risk(sme_profile: str, risk_profile: str, dscr: float, loan_amount: float, loan_type: str) -> Optional[Decision]:
+    _require_profile("evaluate_ntb_risk", "NTB", sme_profile)
+    return evaluate_sme_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
 
 # --------------------------------------------------
 # Final Outcome
 # --------------------------------------------------
-def finalize_conditional_pass(decision: dict, provided_docs: List[str], sme_profile: str) -> dict:
+# Resolved once instead of on every conditional pass
+_COMMON_DOCUMENTS = REQUIRED_DOCUMENTS["common"]
+
+@lru_cache(maxsize=256)
+def _conditional_explanation(explanation: str) -> str:
+    # Rule explanations are a small fixed set, so each conditional variant is built only once
+    return explanation + " Conditional approval pending submission of required documents."
+
+def finalize_conditional_pass(decision: Dict[str, Any], provided_docs: List[str], sme_profile: str) -> Dict[str, Any]:
     """
     Updates a decision that was previously marked "PROGRESS" by checking the required documents.
     If any required documents (merged from common and SME-specific) are missing, they are attached
     to the decision and the outcome is set to CONDITIONAL_PASS.
     """
-    # Merge common and SME-specific required documents
-    required_docs = REQUIRED_DOCUMENTS.get("common", {}).copy()
-    # Use SME profile as key if present (e.g., "EB", "ESB", "NTB", "SU")
-    if sme_profile in REQUIRED_DOCUMENTS:
-        required_docs.update(REQUIRED_DOCUMENTS.get(sme_profile, {}))
-    
-    missing_docs = {}
-    for doc, description in required_docs.items():
-        if doc not in provided_docs:
-            missing_docs[doc] = description
+    # Common and SME-specific required documents are pre-merged per SME profile
+    # (e.g., "EB", "ESB", "NTB", "SU"); other profiles only need the common documents.
+    required_docs = REQUIRED_DOCUMENTS_BY_SME.get(sme_profile, _COMMON_DOCUMENTS)
+
+    # Set membership instead of rescanning the provided list for every required document
+    provided = set(provided_docs)
+    missing_docs = {doc: description for doc, description in required_docs.items() if doc not in provided}
 
     # Update the decision outcome to CONDITIONAL_PASS and attach missing documents.
-    decision["decision"] = DECISIONS["CONDITIONAL_PASS"]["value"]
+    decision["decision"] = _CONDITIONAL_PASS
     decision["missing_documents"] = missing_docs
-    decision["explanation"] += " Conditional approval pending submission of required documents."
+    decision["explanation"] = _conditional_explanation(decision["explanation"])
     return decision
 
 def evaluate_application(
@@ -302,7 +304,7 @@ def evaluate_application(
     loan_type: str,
     industry_sector: str,
     provided_docs: List[str]
-) -> dict:
+) -> Dict[str, Any]:
     """
     Evaluate an application by:
       1. Checking global criteria.
@@ -313,46 +315,41 @@ def evaluate_application(
     Note: If DSCR or other financial metrics are updated in a subsequent API call,
     the outcome may change (e.g., to FAIL if DSCR falls below the threshold).
     """
+    dscr = float(dscr)
+    loan_amount = float(loan_amount)
+
     # Global Checks (these could be expanded as needed)
     if dscr < MIN_DSCR:
-        decision = {
-            "decision": DECISIONS["FAIL"]["value"],
-            "confidence": 0.99,
-            "explanation": f"DSCR of {dscr} is below the minimum threshold of {MIN_DSCR}. Loan declined."
-        }
-        logger.info(f"Global check failure: {decision}")
+        decision = _hard_fail(_dscr_floor_explanation(dscr))
+        logger.info("Global check failure: %s", decision)
         return decision
 
     if loan_amount < MIN_LOAN_AMOUNT:
-        decision = {
-            "decision": DECISIONS["FAIL"]["value"],
-            "confidence": 0.99,
-            "explanation": f"Loan amount £{loan_amount} is below the minimum threshold of £{MIN_LOAN_AMOUNT}."
-        }
-        logger.info(f"Global check failure: {decision}")
+        decision = _hard_fail(_min_amount_explanation(loan_amount))
+        logger.info("Global check failure: %s", decision)
         return decision
 
-    # Call the appropriate risk evaluation function based on SME profile.
-    # (Assuming that evaluate_eb_risk, evaluate_esb_risk, and evaluate_ntb_risk are defined.)
-    if sme_profile == "EB":
-        decision = evaluate_eb_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
-    elif sme_profile == "ESB":
-        decision = evaluate_esb_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
-    elif sme_profile == "NTB":
-        decision = evaluate_ntb_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
+    # Run the risk evaluation for supported SME profiles.
+    if sme_profile in EVALUATED_SME_PROFILES:
+        result = evaluate_sme_risk(sme_profile, risk_profile, dscr, loan_amount, loan_type)
     else:
         # For other profiles (or Startups if not handled elsewhere), return FAIL
-        decision = {
-            "decision": DECISIONS["FAIL"]["value"],
-            "confidence": 0.99,
-            "explanation": f"SME profile '{sme_profile}' is not supported for the Happy Path."
-        }
-        logger.info(f"SME profile failure: {decision}")
+        decision = _hard_fail(_unsupported_profile_explanation(sme_profile))
+        logger.info("SME profile failure: %s", decision)
         return decision
 
+    if result is None:
+        error_msg = (f"No {sme_profile} rule covers risk profile {risk_profile}, DSCR {dscr}, "
+                     f"£{loan_amount} {loan_type} loan.")
+        logger.error(error_msg)
+        raise EvaluationError(error_msg)
+
+    # Risk evaluators return shared immutable Decisions; copy before adding conditions and scores.
+    decision = result.to_dict()
+
     # At this point, the risk evaluation function returned "PROGRESS" for eligible scenarios.
     # Now integrate the required documents checklist.
-    if decision["decision"] == DECISIONS["PROGRESS"]["value"]:
+    if decision["decision"] == _PROGRESS:
         decision = finalize_conditional_pass(decision, provided_docs, sme_profile)
 
     # Optionally, you could calculate overall risk and adjust conditions further (e.g., PG percentage).
@@ -366,14 +363,15 @@ def evaluate_application(
     
     return decision
 
+# DSCR level thresholds (ascending) and the level for each band between them
+_DSCR_LEVEL_EDGES = (1.35, 1.5)
+_DSCR_LEVELS = ("low", "medium", "high")
+
 def get_dscr_level(dscr: float) -> str:
     """
     Helper function to categorize DSCR into 'high', 'medium', or 'low'.
-    Thresholds can be adjusted based on your business rules.
+    Thresholds can be adjusted based on your business rules (_DSCR_LEVEL_EDGES).
     """
-    if dscr >= 1.5:
-        return "high"
-    elif dscr >= 1.35:
-        return "medium"
-    else:
-        return "low"
+    # bisect_right puts a value equal to an edge in the band above it (>= semantics);
+    # NaN fails every comparison and is treated as 'low'
+    return _DSCR_LEVELS[bisect_right(_DSCR_LEVEL_EDGES, dscr)] if dscr == dscr else "low"
@@ -1,12 +1,13 @@
 import os
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 import uvicorn
 import logging
 from typing import List
 from datetime import datetime
 from narrative import (
     generate_underwriter_narrative,
+    generate_underwriter_narratives,
     generate_and_verify_narrative,
     check_underwriter_narrative,
     get_underwriter_schema
@@ -15,9 +16,11 @@ from logic import (
     evaluate_borrower_type,
     evaluate_application
 )
+from batch import evaluate_batch, decision_columns
+from config import init_logging, intern_key
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+init_logging()
 IS_STAGING = os.getenv("STAGING", "False").lower() == "true"
 
 app = FastAPI(
@@ -65,6 +68,32 @@ class SMERiskRequest(BaseModel):
     is_due_diligence_complete: bool = Field(default=True, description="True if AML/KYC and due diligence are complete")
     is_business_registered: bool = Field(default=True, description="True if business registration is verified")
 
+    @field_validator("loan_type")
+    @classmethod
+    def normalize_loan_type(cls, value: str) -> str:
+        # Normalized once here ("Secured" -> "secured"), so the rules downstream can match exactly
+        return intern_key(value.strip().lower())
+
+# Column-per-field (one entry per application) batch of SME risk inputs for evaluate_batch.
+class SMERiskBatchRequest(BaseModel):
+    sme_profile: List[str] = Field(alias="smeProfile")
+    risk_profile: List[str] = Field(alias="riskProfile")
+    dscr: List[float] = Field(alias="stressedDSCR")
+    loan_amount: List[float] = Field(alias="loanAmount")
+    loan_type: List[str] = Field(alias="loanType")
+
+    @field_validator("loan_type")
+    @classmethod
+    def normalize_loan_types(cls, values: List[str]) -> List[str]:
+        return [intern_key(value.strip().lower()) for value in values]
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "SMERiskBatchRequest":
+        lengths = {len(self.sme_profile), len(self.risk_profile), len(self.dscr), len(self.loan_amount), len(self.loan_type)}
+        if len(lengths) > 1:
+            raise ValueError("All batch columns must have the same length")
+        return self
+
 # -------------------------------
 # API Endpoints
 # -------------------------------
@@ -76,12 +105,12 @@ async def evaluate_borrower_type_endpoint(request: BorrowerTypeRequest):
 async def evaluate_sme_risk_endpoint(request: SMERiskRequest):
     try:
         result = evaluate_application(
-            sme_profile=request.sme_profile,
-            risk_profile=request.risk_profile,
+            sme_profile=intern_key(request.sme_profile),
+            risk_profile=intern_key(request.risk_profile),
             dscr=request.dscr,
             loan_amount=request.loan_amount,
             loan_type=request.loan_type,
-            industry_sector=request.industry_sector,
+            industry_sector=intern_key(request.industry_sector),
             provided_docs=request.provided_docs
         )
         return result
@@ -89,6 +118,18 @@ async def evaluate_sme_risk_endpoint(request: SMERiskRequest):
         logger.exception("Unexpected error during SME risk evaluation")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Vectorized decision stage for portfolio re-scoring. Returns one column per output field, with
+# each row reported as /evaluate/sme-risk reports it (decision, confidence, explanation); rows that
+# no rule covers are null.
+@app.post("/evaluate/sme-risk-batch")
+def evaluate_sme_risk_batch_endpoint(request: SMERiskBatchRequest):
+    try:
+        columns = request.model_dump()
+        return decision_columns(columns, evaluate_batch(columns))
+    except Exception as e:
+        logger.exception("Unexpected error during batch SME risk evaluation")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.get("/underwriter-schema")
 async def underwriter_schema_endpoint():
     if IS_STAGING:
@@ -101,26 +142,36 @@ async def underwriter_schema_endpoint():
             "action_id": "g-bebaea08fb7964507a70a86a705414e10fbe0f9b"
         }
 
+# The narrative endpoints block on GPT calls, so they are plain functions: FastAPI runs them in
+# its threadpool instead of on the event loop.
 @app.post("/generate-narrative")
-async def generate_narrative_endpoint(evaluation: EvaluationDecision):
+def generate_narrative_endpoint(evaluation: EvaluationDecision):
     try:
-        narrative = generate_underwriter_narrative(evaluation.dict())
+        narrative = generate_underwriter_narrative(evaluation.model_dump())
         return {"narrative": narrative}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-narratives")
+def generate_narratives_endpoint(evaluations: List[EvaluationDecision]):
+    try:
+        narratives = generate_underwriter_narratives([evaluation.model_dump() for evaluation in evaluations])
+        return {"narratives": narratives}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/generate-and-verify-narrative")
-async def generate_and_verify_narrative_endpoint(evaluation: EvaluationDecision):
+def generate_and_verify_narrative_endpoint(evaluation: EvaluationDecision):
     try:
-        narrative = generate_and_verify_narrative(evaluation.dict())
+        narrative = generate_and_verify_narrative(evaluation.model_dump())
         return {"narrative": narrative}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/check-narrative")
-async def check_narrative_endpoint(request: NarrativeCheckRequest):
+def check_narrative_endpoint(request: NarrativeCheckRequest):
     try:
-        result = check_underwriter_narrative(request.narrative, request.evaluation.dict())
+        result = check_underwriter_narrative(request.narrative, request.evaluation.model_dump())
         return {"check_result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,32 +1,26 @@
 # underwriter.py
 
-import copy
+import json
 import logging
-from datetime import datetime
-from typing import Dict, List
-from pydantic import BaseModel
-from gpt_client import call_gpt
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from gpt_client import call_gpt, call_gpt_choices
+from config import DECISIONS, freeze
 
 logger = logging.getLogger(__name__)
 
 # -------------------------------
-# Underwriter Schema Models and Definition
+# Underwriter Schema Definition
 # -------------------------------
-class UnderwriterInstructions(BaseModel):
-    role: str
-    objective: str
-    prompt_guidelines: List[str]
-    output_structure: Dict[str, str]
-
-class UnderwriterSchemaModel(BaseModel):
-    version: str
-    instructions: UnderwriterInstructions
-    data_sources: Dict[str, str]
-    fallback: str
-    audit_and_versioning: Dict[str, str]
-    compliance_notes: str
-
-UNDERWRITER_SCHEMA = {
+UNDERWRITER_SCHEMA: Mapping[str, Any] = {
     "version": "1.0",
     "instructions": {
         "role": "Underwriter GPT",
@@ -70,20 +64,42 @@ UNDERWRITER_SCHEMA = {
         "Any deviations should be clearly documented."
     )
 }
+# Shared, read-only template; per-call data is layered on top (see get_underwriter_schema)
+UNDERWRITER_SCHEMA = freeze(UNDERWRITER_SCHEMA)
 
-def get_underwriter_schema() -> Dict:
+# Audit timestamps are reused for up to _TIMESTAMP_TTL seconds (millisecond precision), so a burst
+# of schema fetches / narrative calls doesn't pay for a clock read + datetime per call.
+_TIMESTAMP_TTL = 0.1
+_timestamp_cache = (0.0, "")
+
+def _audit_timestamp() -> str:
+    global _timestamp_cache
+    expiry, stamp = _timestamp_cache
+    now = time.monotonic()
+    if now >= expiry:
+        stamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        _timestamp_cache = (now + _TIMESTAMP_TTL, stamp)
+    return stamp
+
+@lru_cache(maxsize=1)
+def _schema_for(timestamp: str) -> Mapping[str, Any]:
+    audit = MappingProxyType(dict(UNDERWRITER_SCHEMA["audit_and_versioning"], timestamp=timestamp))
+    return MappingProxyType({**UNDERWRITER_SCHEMA, "audit_and_versioning": audit})
+
+def get_underwriter_schema() -> Mapping[str, Any]:
     """
     Returns the underwriter schema with an updated audit timestamp.
+    The static sections are the shared read-only template; only the top level and the audit
+    section are rebuilt. The result is read-only and shared by every caller within one timestamp
+    window, so repeated fetches build nothing.
     """
-    schema = copy.deepcopy(UNDERWRITER_SCHEMA)
-    schema["audit_and_versioning"]["timestamp"] = datetime.utcnow().isoformat() + "Z"
-    return schema
+    return _schema_for(_audit_timestamp())
 
 # -------------------------------
 # Prompt Modularization Functions
 # -------------------------------
 
-def build_business_logic_section(schema: dict) -> str:
+def build_business_logic_section(schema: Mapping) -> str:
     """
     Constructs the section of the prompt that explains the business logic.
     """
@@ -121,52 +137,192 @@ def build_additional_context_section(timestamp: str, request_id: str) -> str:
     """
     return f"Additional Context: Timestamp: {timestamp}, Request ID: {request_id}\n"
 
-def build_objective_section(schema: dict) -> str:
+def build_objective_section(schema: Mapping) -> str:
     """
     Constructs the objective section of the prompt.
     """
     return f"Objective:\n{schema['instructions']['objective']}\n"
 
-# -------------------------------
-# Narrative Generation Functions Using Modular Prompts
-# -------------------------------
+# The schema is frozen, so the business-logic and objective sections never change: render them once
+_NARRATIVE_PROMPT_HEADER = (
+    f"{build_business_logic_section(UNDERWRITER_SCHEMA)}\n"
+    f"{build_objective_section(UNDERWRITER_SCHEMA)}\n"
+)
 
-def generate_underwriter_narrative(evaluation_decision: dict) -> str:
+# Generated narratives are cached and shared, so the prompt carries a placeholder instead of the
+# audit timestamp; the timestamp of the request being served is filled in on the way out (_stamp).
+AUDIT_TIMESTAMP_PLACEHOLDER = "[AUDIT_TIMESTAMP]"
+_TIMESTAMP_INSTRUCTION = (
+    f"Write the audit timestamp exactly as {AUDIT_TIMESTAMP_PLACEHOLDER}; "
+    "it is filled in when the narrative is delivered."
+)
+
+def _ensure_placeholder(narrative: str) -> str:
     """
-    Generate a detailed narrative explanation using modular prompt sections.
+    Appends an audit timestamp line when the model dropped or rewrote the placeholder, so every
+    narrative that is cached or delivered still gets the serving request's timestamp.
+    """
+    if AUDIT_TIMESTAMP_PLACEHOLDER in narrative:
+        return narrative
+    logger.warning("Narrative is missing the audit timestamp placeholder; appending it.")
+    return f"{narrative.rstrip()}\n\nAudit timestamp: {AUDIT_TIMESTAMP_PLACEHOLDER}"
+
+def _stamp(narrative: str, timestamp: Optional[str] = None) -> str:
+    return narrative.replace(AUDIT_TIMESTAMP_PLACEHOLDER, timestamp or _audit_timestamp())
+
+def build_narrative_prompt(evaluation_decision: dict) -> str:
+    """
+    Assembles the full single-application narrative prompt.
     """
-    schema = get_underwriter_schema()
-    timestamp = schema["audit_and_versioning"]["timestamp"]
     request_id = evaluation_decision.get("request_id", "N/A")
     
-    business_logic = build_business_logic_section(schema)
-    objective = build_objective_section(schema)
     evaluation_details = build_evaluation_details_section(evaluation_decision)
-    additional_context = build_additional_context_section(timestamp, request_id)
+    additional_context = build_additional_context_section(AUDIT_TIMESTAMP_PLACEHOLDER, request_id)
     
-    prompt = (
-        f"{business_logic}\n"
-        f"{objective}\n"
+    return (
+        f"{_NARRATIVE_PROMPT_HEADER}"
         f"{evaluation_details}\n"
         f"{additional_context}\n"
-        "Please generate the narrative explanation."
+        f"Please generate the narrative explanation. {_TIMESTAMP_INSTRUCTION}"
     )
-    
-    logger.debug(f"Underwriter narrative prompt: {prompt}")
+
+# -------------------------------
+# Narrative Cache
+# -------------------------------
+# Evaluation decisions repeat heavily, so narratives are cached for NARRATIVE_CACHE_TTL seconds,
+# keyed by the rendered evaluation details and request id (everything the prompt contains). The
+# cached text still holds AUDIT_TIMESTAMP_PLACEHOLDER, so no request's timestamp is ever shared.
+# Verified narratives are cached separately so they are never served for an unverified request
+# and vice versa.
+NARRATIVE_CACHE_TTL = 3600.0
+NARRATIVE_CACHE_SIZE = 2048
+
+_narrative_cache: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
+_narrative_cache_lock = threading.Lock()
+
+def _narrative_key(kind: str, evaluation_decision: dict) -> tuple:
+    return (kind, build_evaluation_details_section(evaluation_decision), evaluation_decision.get("request_id", "N/A"))
+
+def _cached_narrative(key: tuple) -> Optional[str]:
+    with _narrative_cache_lock:
+        entry = _narrative_cache.get(key)
+        if entry is None:
+            return None
+        expiry, narrative = entry
+        if time.monotonic() >= expiry:
+            del _narrative_cache[key]
+            return None
+        _narrative_cache.move_to_end(key)
+        return narrative
+
+def _cache_narrative(key: tuple, narrative: str) -> None:
+    with _narrative_cache_lock:
+        _narrative_cache[key] = (time.monotonic() + NARRATIVE_CACHE_TTL, narrative)
+        _narrative_cache.move_to_end(key)
+        if len(_narrative_cache) > NARRATIVE_CACHE_SIZE:
+            _narrative_cache.popitem(last=False)
+
+def _drop_cached_narrative(key: tuple) -> None:
+    with _narrative_cache_lock:
+        _narrative_cache.pop(key, None)
+
+def clear_narrative_cache() -> None:
+    with _narrative_cache_lock:
+        _narrative_cache.clear()
+
+# -------------------------------
+# Narrative Generation Functions Using Modular Prompts
+# -------------------------------
+
+def generate_underwriter_narrative(evaluation_decision: dict) -> str:
+    """
+    Generate a detailed narrative explanation using modular prompt sections.
+    Repeat requests for the same evaluation are served from the narrative cache.
+    """
+    return _stamp(_generated_narrative(evaluation_decision))
+
+def _generated_narrative(evaluation_decision: dict) -> str:
+    """
+    Cached or freshly generated narrative, still holding the timestamp placeholder.
+    """
+    key = _narrative_key("generated", evaluation_decision)
+    narrative = _cached_narrative(key)
+    if narrative is not None:
+        logger.debug("Underwriter narrative served from cache.")
+        return narrative
+
+    prompt = build_narrative_prompt(evaluation_decision)
+    logger.debug("Underwriter narrative prompt: %s", prompt)
     try:
-        narrative = call_gpt(prompt)
-        logger.debug(f"Underwriter narrative response: {narrative}")
+        narrative = _ensure_placeholder(call_gpt(prompt))
+        logger.debug("Underwriter narrative response: %s", narrative)
     except Exception as e:
-        logger.error(f"Error generating narrative: {e}")
+        logger.error("Error generating narrative: %s", e)
         raise Exception(f"Failed to generate narrative due to GPT API error: {e}")
+    _cache_narrative(key, narrative)
     return narrative
 
+def _request_narrative_candidates(evaluation_decision: dict, n: int) -> List[str]:
+    """
+    Requests n independent narratives for one evaluation in a single GPT call (bypasses the cache).
+    Like _generated_narrative, the results still hold the timestamp placeholder.
+    """
+    prompt = build_narrative_prompt(evaluation_decision)
+    logger.debug("Underwriter narrative candidates prompt (n=%d): %s", n, prompt)
+    try:
+        candidates = [_ensure_placeholder(candidate) for candidate in call_gpt_choices(prompt, n)]
+        logger.debug("Underwriter narrative candidates: %s", candidates)
+    except Exception as e:
+        logger.error("Error generating narrative candidates: %s", e)
+        raise Exception(f"Failed to generate narrative due to GPT API error: {e}")
+    return candidates
+
+# -------------------------------
+# Local Narrative Checks
+# -------------------------------
+# Decision verdicts are matched verbatim (e.g. "CONDITIONAL_PASS", "FLAG/UW"). A narrative is
+# rejected without a GPT round-trip only when it states a different outcome ("Decision: FAIL" for a
+# CONDITIONAL_PASS), or names other verdicts but never its own. Passing mentions such as "did not
+# FAIL any checks" alongside the right verdict are fine. By default a narrative that names its own
+# verdict and states no other is accepted locally too, so GPT only sees narratives that name no
+# verdict at all. Set STRICT_NARRATIVE_CHECK=true to send every narrative not rejected locally to GPT.
+STRICT_NARRATIVE_CHECK = os.getenv("STRICT_NARRATIVE_CHECK", "false").lower() == "true"
+
+_VERDICTS = tuple(entry["value"] for entry in DECISIONS.values())
+# Longest first, so e.g. CONDITIONAL_PASS is never read as a shorter verdict
+_VERDICT_ALTERNATION = "|".join(re.escape(v) for v in sorted(_VERDICTS, key=len, reverse=True))
+_VERDICT_PATTERN = re.compile(r"(?<![\w/])(" + _VERDICT_ALTERNATION + r")(?![\w/])")
+# A verdict given as the outcome: "Decision: FAIL", "the outcome is **CONDITIONAL_PASS**", ...
+_STATED_OUTCOME_PATTERN = re.compile(
+    r"\b(?i:decision|outcome|verdict)\b(?:\s+(?i:is|was|of))?\s*[:\-\u2013]?\s*[*\"'`]*"
+    r"(" + _VERDICT_ALTERNATION + r")(?![\w/])"
+)
+
+def _local_narrative_check(narrative: str, decision: str) -> Optional[str]:
+    """
+    Returns a check result when the verdicts in the narrative settle it, otherwise None.
+    """
+    stated = set(_STATED_OUTCOME_PATTERN.findall(narrative)) - {decision}
+    if stated:
+        return f"Narrative states the outcome as {', '.join(sorted(stated))} but the evaluation decision is {decision}."
+    named = set(_VERDICT_PATTERN.findall(narrative))
+    if named and decision not in named:
+        return f"Narrative names {', '.join(sorted(named))} but never the evaluation decision {decision}."
+    if named and not STRICT_NARRATIVE_CHECK:
+        return "No contradictions found."
+    return None
+
 def check_underwriter_narrative(narrative: str, evaluation_decision: dict) -> str:
     """
     Check the generated narrative for consistency using modular prompt sections.
+    Clear verdict contradictions are caught locally before calling GPT.
     """
-    schema = get_underwriter_schema()
-    timestamp = schema["audit_and_versioning"]["timestamp"]
+    local_result = _local_narrative_check(narrative, evaluation_decision["decision"])
+    if local_result is not None:
+        logger.debug("Underwriter narrative check resolved locally: %s", local_result)
+        return local_result
+
+    timestamp = _audit_timestamp()
     request_id = evaluation_decision.get("request_id", "N/A")
     
     evaluation_details = build_evaluation_details_section(evaluation_decision)
@@ -182,32 +338,185 @@ def check_underwriter_narrative(narrative: str, evaluation_decision: dict) -> st
         "Otherwise, list any inconsistencies."
     )
     
-    logger.debug(f"Underwriter narrative check prompt: {prompt}")
+    logger.debug("Underwriter narrative check prompt: %s", prompt)
     try:
         check_result = call_gpt(prompt)
-        logger.debug(f"Underwriter narrative check response: {check_result}")
+        logger.debug("Underwriter narrative check response: %s", check_result)
     except Exception as e:
-        logger.error(f"Error checking narrative: {e}")
+        logger.error("Error checking narrative: %s", e)
         raise Exception(f"Failed to check narrative due to GPT API error: {e}")
     return check_result
 
+# After a failed first check, the remaining candidates come from one multi-choice GPT request and
+# are checked in parallel rather than one after another (worst case two GPT round-trips instead of
+# four). Set to False to check the candidates sequentially.
+SPECULATIVE_RETRIES = True
+
+def _passes_check(evaluation_decision: dict, attempt: int, narrative: str) -> bool:
+    try:
+        check_result = check_underwriter_narrative(_stamp(narrative), evaluation_decision)
+    except Exception as e:
+        logger.error("Error during narrative check on attempt %d: %s", attempt, e)
+        return False
+    if "No contradictions found" in check_result:
+        return True
+    logger.info("Attempt %d: discrepancies found - %s. Retrying narrative generation...", attempt, check_result)
+    return False
+
 def generate_and_verify_narrative(evaluation_decision: dict) -> str:
     """
     Generate and verify narrative explanation with up to 3 retries if inconsistencies are found.
+    Only narratives that pass the check are cached.
     """
+    key = _narrative_key("verified", evaluation_decision)
+    narrative = _cached_narrative(key)
+    if narrative is not None:
+        logger.debug("Verified narrative served from cache.")
+        return _stamp(narrative)
+
+    generated_key = _narrative_key("generated", evaluation_decision)
     max_retries = 3
     narrative = ""
-    for attempt in range(max_retries):
-        logger.debug(f"Attempt {attempt+1} for narrative generation.")
+    verified = False
+    logger.debug("Attempt 1 for narrative generation.")
+    try:
+        narrative = _generated_narrative(evaluation_decision)
+        verified = _passes_check(evaluation_decision, 1, narrative)
+    except Exception as e:
+        logger.error("Error during narrative generation on attempt 1: %s", e)
+
+    if not verified:
+        # Don't let anyone else be served the narrative that just failed the check
+        _drop_cached_narrative(generated_key)
+        logger.debug("Attempts 2-%d for narrative generation.", max_retries)
         try:
-            narrative = generate_underwriter_narrative(evaluation_decision)
-            check_result = check_underwriter_narrative(narrative, evaluation_decision)
+            candidates = _request_narrative_candidates(evaluation_decision, max_retries - 1)
         except Exception as e:
-            logger.error(f"Error during narrative generation/check on attempt {attempt+1}: {e}")
-            continue
-        if "No contradictions found" in check_result:
-            return narrative
+            logger.error("Error during narrative generation on attempts 2-%d: %s", max_retries, e)
+            candidates = []
+        attempts = range(2, 2 + len(candidates))
+        results: Iterable[bool]
+        if SPECULATIVE_RETRIES and len(candidates) > 1:
+            with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                results = list(pool.map(lambda a, c: _passes_check(evaluation_decision, a, c), attempts, candidates))
         else:
-            logger.info(f"Attempt {attempt+1}: discrepancies found - {check_result}. Retrying narrative generation...")
+            results = (_passes_check(evaluation_decision, a, c) for a, c in zip(attempts, candidates))
+        # First passing candidate in attempt order, otherwise the last one generated
+        for candidate, verified in zip(candidates, results):
+            narrative = candidate
+            if verified:
+                break
+
+    if verified:
+        _cache_narrative(key, narrative)
+        _cache_narrative(generated_key, narrative)
+        return _stamp(narrative)
     logger.warning("Max retries reached. Returning last generated narrative despite discrepancies.")
-    return narrative
+    return _stamp(narrative)
+
+# -------------------------------
+# Batched Narrative Generation
+# -------------------------------
+# Several applications share one prompt (the business logic and objective sections are sent once
+# per batch instead of once per application), and batches are sent concurrently.
+NARRATIVE_BATCH_SIZE = 8
+NARRATIVE_BATCH_WORKERS = 4
+NARRATIVE_TOKENS_PER_APPLICATION = 300
+
+def build_batch_prompt(evaluation_decisions: List[dict]) -> str:
+    """
+    Constructs a single prompt covering several evaluation decisions, keyed by app_id.
+    """
+    applications = "\n".join(
+        f"Application {app_id}:\n"
+        f"{build_evaluation_details_section(decision)}"
+        f"{build_additional_context_section(AUDIT_TIMESTAMP_PLACEHOLDER, decision.get('request_id', 'N/A'))}"
+        for app_id, decision in enumerate(evaluation_decisions)
+    )
+    return (
+        f"{_NARRATIVE_PROMPT_HEADER}"
+        f"{applications}\n"
+        f"Please generate one narrative explanation per application. {_TIMESTAMP_INSTRUCTION} "
+        "Reply with only a JSON object of the form "
+        '{"narratives": [{"app_id": <application number>, "narrative": "<narrative text>"}, ...]}.'
+    )
+
+# Models sometimes wrap JSON in a Markdown code fence even when asked not to
+_CODE_FENCE = re.compile(r"^```[\w-]*\s*(.*?)\s*```$", re.DOTALL)
+
+def _parse_batch_response(response: str) -> Dict[int, str]:
+    """
+    Maps app_id to narrative from a batch response; malformed or empty entries are skipped.
+    """
+    text = response.strip()
+    fenced = _CODE_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        logger.warning("Batch narrative response is not valid JSON.")
+        return {}
+    items = parsed.get("narratives") if isinstance(parsed, dict) else parsed
+    narratives = {}
+    for item in items if isinstance(items, list) else ():
+        try:
+            app_id, narrative = int(item["app_id"]), item["narrative"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        # null / non-string / blank narratives count as missing, not as the text "None"
+        if isinstance(narrative, str) and narrative.strip():
+            narratives[app_id] = _ensure_placeholder(narrative)
+    return narratives
+
+def _generate_narrative_batch(evaluation_decisions: List[dict]) -> List[str]:
+    prompt = build_batch_prompt(evaluation_decisions)
+    logger.debug("Batch narrative prompt: %s", prompt)
+    try:
+        response = call_gpt(prompt, max_tokens=NARRATIVE_TOKENS_PER_APPLICATION * len(evaluation_decisions),
+                            json_mode=True)
+        logger.debug("Batch narrative response: %s", response)
+    except Exception as e:
+        logger.error("Error generating batch narrative: %s", e)
+        raise Exception(f"Failed to generate narratives due to GPT API error: {e}")
+
+    narratives = _parse_batch_response(response)
+    missing = sum(1 for app_id in range(len(evaluation_decisions)) if app_id not in narratives)
+    if missing:
+        logger.warning("Batch narrative response missing %d of %d applications; generating individually.",
+                       missing, len(evaluation_decisions))
+    results = []
+    for app_id, decision in enumerate(evaluation_decisions):
+        if app_id in narratives:
+            _cache_narrative(_narrative_key("generated", decision), narratives[app_id])
+            results.append(narratives[app_id])
+        else:
+            # Anything the batch response didn't cover falls back to a single-application call
+            results.append(_generated_narrative(decision))
+    return results
+
+def generate_underwriter_narratives(evaluation_decisions: List[dict]) -> List[str]:
+    """
+    Generate narratives for several evaluation decisions, NARRATIVE_BATCH_SIZE per GPT call.
+    Cached narratives are reused and only the rest are sent. Narratives are returned in the same
+    order as the decisions.
+    """
+    cached = [_cached_narrative(_narrative_key("generated", decision)) for decision in evaluation_decisions]
+    pending = [index for index, narrative in enumerate(cached) if narrative is None]
+    batches = [pending[i:i + NARRATIVE_BATCH_SIZE] for i in range(0, len(pending), NARRATIVE_BATCH_SIZE)]
+
+    def run(batch: List[int]) -> List[str]:
+        return _generate_narrative_batch([evaluation_decisions[index] for index in batch])
+
+    if len(batches) <= 1:
+        generated = [run(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(NARRATIVE_BATCH_WORKERS, len(batches))) as pool:
+            generated = list(pool.map(run, batches))
+    # Every pending index is filled: _generate_narrative_batch returns one narrative per decision
+    generated_by_index: Dict[int, str] = {}
+    for batch, narratives in zip(batches, generated):
+        generated_by_index.update(zip(batch, narratives))
+    timestamp = _audit_timestamp()
+    return [_stamp(narrative if narrative is not None else generated_by_index[index], timestamp)
+            for index, narrative in enumerate(cached)]
@@ -0,0 +1,116 @@
+from functools import lru_cache
+from typing import Dict, Final, Tuple, cast
+from config import (
+    CONFIG,
+    SME_PROFILES,
+    SME_CONFIDENCE_ADJUSTMENTS,
+    RISK_CONFIDENCE_ADJUSTMENTS,
+    DSCR_CONFIDENCE_ADJUSTMENTS,
+    INDUSTRY_CONFIDENCE_ADJUSTMENTS,
+    SME_RISK_SCORES,
+    DSCR_RISK_SCORES,
+    CREDIT_RISK_SCORES,
+    INDUSTRY_RISK_SCORES,
+    WEIGHT_SME,
+    WEIGHT_DSCR,
+    WEIGHT_CREDIT,
+    WEIGHT_INDUSTRY,
+    PG_BASE_PERCENTAGE,
+    PG_MAX_PERCENTAGE,
+    PG_MIN_RISK,
+    PG_MAX_RISK
+)
+
+# --------------------------------------------------
+# Scoring Hot Path
+# --------------------------------------------------
+# The per-request numeric scoring functions, kept free of I/O and fully annotated (with Final
+# module constants) so this module can be compiled with mypyc as-is:
+#     mypyc scoring.py            (or: mypyc logic.py scoring.py)
+# The plain-Python module is used whenever no compiled build is present.
+
+# --------------------------------------------------
+# Confidence
+# --------------------------------------------------
+# Base SME confidence, with and without the SME adjustment already applied
+_SME_BASE_CONFIDENCE: Final[Dict[str, float]] = {
+    k: cast(float, v["confidence"]) for k, v in SME_PROFILES.items()
+}
+_SME_BASE_PLUS_ADJUST: Final[Dict[str, float]] = {
+    k: _SME_BASE_CONFIDENCE[k] + SME_CONFIDENCE_ADJUSTMENTS.get(k, 0.0) for k in SME_PROFILES
+}
+_LOAN_ADJUSTMENT_FACTOR: Final[float] = CONFIG["loan_adjustment_factor"]
+# Every industry adjustment is currently 0.0; skip the lookup until one is configured
+_INDUSTRY_ADJ_ALL_ZERO: Final[bool] = not any(INDUSTRY_CONFIDENCE_ADJUSTMENTS.values())
+
+# Not on any request path: evaluate_application takes its confidence from the matched rule's
+# Decision. Kept for direct callers and as the reference for batch.adjust_confidence_batch.
+@lru_cache(maxsize=4096)
+def adjust_confidence(sme_profile: str, requested_loan: float, min_loan: float, max_loan: float,
+                      risk_profile: str, dscr_level: str, industry_sector: str) -> float:
+
+    base_confidence = _SME_BASE_PLUS_ADJUST.get(sme_profile, 0.75)
+
+    # Kept as a true division: multiplying by a precomputed reciprocal is not bit-identical, and
+    # with the lru_cache above this line only runs on a cache miss anyway.
+    denominator = (max_loan - min_loan) or 1.0
+    reduction = ((requested_loan - min_loan) / denominator) * _LOAN_ADJUSTMENT_FACTOR
+    loan_conf = base_confidence - reduction
+    if loan_conf < 0.50:
+        loan_conf = 0.50
+    risk_conf = loan_conf + RISK_CONFIDENCE_ADJUSTMENTS.get(risk_profile, 0)
+    final_conf = risk_conf + DSCR_CONFIDENCE_ADJUSTMENTS.get(dscr_level, 0)
+    if not _INDUSTRY_ADJ_ALL_ZERO:
+        final_conf += INDUSTRY_CONFIDENCE_ADJUSTMENTS.get(industry_sector, 0)
+    # Plain comparisons instead of max(min(...)) calls; NaN still passes straight through
+    return 0.50 if final_conf < 0.50 else (1.00 if final_conf > 1.00 else final_conf)
+
+# --------------------------------------------------
+# Overall Risk
+# --------------------------------------------------
+# Precomputed overall risk for every known (sme, dscr, credit, industry) combination
+_OVERALL_RISK_TABLE: Final[Dict[Tuple[str, str, str, str], float]] = {
+    (s, d, c, i): (WEIGHT_SME * SME_RISK_SCORES[s] +
+                   WEIGHT_DSCR * DSCR_RISK_SCORES[d] +
+                   WEIGHT_CREDIT * CREDIT_RISK_SCORES[c] +
+                   WEIGHT_INDUSTRY * INDUSTRY_RISK_SCORES[i])
+    for s in SME_RISK_SCORES
+    for d in DSCR_RISK_SCORES
+    for c in CREDIT_RISK_SCORES
+    for i in INDUSTRY_RISK_SCORES
+}
+
+def calculate_overall_risk(sme_profile: str, dscr_level: str, credit_profile: str, industry_sector: str) -> float:
+    """
+    Calculates an overall risk score by applying weights to the risk scores of each factor.
+    Lower overall scores indicate lower risk.
+    """
+    overall_risk = _OVERALL_RISK_TABLE.get((sme_profile, dscr_level, credit_profile, industry_sector))
+    if overall_risk is not None:
+        return overall_risk
+
+    # Unknown key(s): retrieve individual risk scores (using default values if a key isn't found)
+    sme_score = SME_RISK_SCORES.get(sme_profile, 2.0)
+    dscr_score = DSCR_RISK_SCORES.get(dscr_level, 2.0)
+    credit_score = CREDIT_RISK_SCORES.get(credit_profile, 2.0)
+    industry_score = INDUSTRY_RISK_SCORES.get(industry_sector, 2.0)
+
+    overall_risk = (WEIGHT_SME * sme_score +
+                    WEIGHT_DSCR * dscr_score +
+                    WEIGHT_CREDIT * credit_score +
+                    WEIGHT_INDUSTRY * industry_score)
+    return overall_risk
+
+# --------------------------------------------------
+# PG Scaling
+# --------------------------------------------------
+# PG scales linearly from PG_BASE_PERCENTAGE at PG_MIN_RISK to PG_MAX_PERCENTAGE at PG_MAX_RISK.
+# Only the two spans are precomputed; folding them further into a slope/intercept pair changes
+# the rounding (e.g. 0.19999999999999996 instead of 0.2 at the lowest risk).
+_PG_RISK_SPAN: Final[float] = PG_MAX_RISK - PG_MIN_RISK
+_PG_SPREAD: Final[float] = PG_MAX_PERCENTAGE - PG_BASE_PERCENTAGE
+
+def determine_pg_percentage(overall_risk: float) -> float:
+    # Normalize the risk score between 0 and 1, then interpolate between base and max PG
+    normalized_risk = (overall_risk - PG_MIN_RISK) / _PG_RISK_SPAN
+    return PG_BASE_PERCENTAGE + normalized_risk * _PG_SPREAD
@@ -0,0 +1,55 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from batch import PROGRESS, RULE_DECISIONS, decision_columns, evaluate_batch
+from config import EvaluationError
+from logic import evaluate_application, evaluate_sme_risk
+
+NAN = float("nan")
+SME_PROFILES = ("EB", "ESB", "NTB", "SU", "XX")
+RISK_PROFILES = ("T1", "T2", "T3", "T4")
+DSCRS = (NAN, 1.0, 1.249, 1.25, math.nextafter(1.25, math.inf), 1.3, 1.5, 2.0)
+LOAN_AMOUNTS = (NAN, 20000.0, 25001.0, 50000.0, 60000.0, 80000.0, 80000.5, 100000.0, 150000.0, 250000.0, 300000.0)
+LOAN_TYPES = ("secured", "unsecured", "Secured", "other")
+
+ROWS = list(itertools.product(SME_PROFILES, RISK_PROFILES, DSCRS, LOAN_AMOUNTS, LOAN_TYPES))
+COLUMNS = dict(zip(("sme_profile", "risk_profile", "dscr", "loan_amount", "loan_type"), map(list, zip(*ROWS))))
+
+
+@pytest.fixture(scope="module")
+def result():
+    return evaluate_batch(COLUMNS)
+
+
+def _scalar(sme, risk, dscr, loan_amount, loan_type):
+    try:
+        decision = evaluate_application(sme, risk, dscr, loan_amount, loan_type, "Wholesale and Retail Trade", [])
+    except EvaluationError:
+        return None, None, None
+    return decision["decision"], decision["confidence"], decision["explanation"]
+
+
+def test_batch_matches_evaluate_application(result):
+    columns = decision_columns(COLUMNS, result)
+    for index, row in enumerate(ROWS):
+        batch = (columns["decision"][index], columns["confidence"][index], columns["explanation"][index])
+        assert batch == _scalar(*row), row
+
+
+def test_batch_rule_ids_are_the_scalar_decisions(result):
+    for index, row in enumerate(ROWS):
+        rule = result["rule"][index]
+        if result["outcome"][index] == PROGRESS:
+            assert evaluate_sme_risk(*row) is RULE_DECISIONS[rule], row
+        else:
+            assert rule == -1, row
+
+
+def test_nan_inputs_never_match_a_rule(result):
+    nan_rows = np.isnan(np.asarray(COLUMNS["dscr"])) | np.isnan(np.asarray(COLUMNS["loan_amount"]))
+    assert nan_rows.any()
+    assert not np.any(result["outcome"][nan_rows] == PROGRESS)
+    assert np.all(result["rule"][nan_rows] == -1)
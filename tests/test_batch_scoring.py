@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+
+from batch import (
+    DSCR_ORDER, INDUSTRY_ORDER, RISK_ORDER, SME_ORDER,
+    adjust_confidence_batch, calculate_overall_risk_batch,
+)
+from scoring import adjust_confidence, calculate_overall_risk
+
+
+def _names(order):
+    # Every known value plus the trailing "unknown" code
+    return order + ("Unknown",)
+
+
+CODE_GRID = list(itertools.product(*(range(len(order) + 1) for order in (SME_ORDER, DSCR_ORDER, RISK_ORDER, INDUSTRY_ORDER))))
+
+
+def test_overall_risk_batch_matches_scalar():
+    sme, dscr, credit, industry = (np.array(column) for column in zip(*CODE_GRID))
+    batch = calculate_overall_risk_batch(sme, dscr, credit, industry)
+    for row, codes in enumerate(CODE_GRID):
+        names = [_names(order)[code] for order, code in zip((SME_ORDER, DSCR_ORDER, RISK_ORDER, INDUSTRY_ORDER), codes)]
+        assert batch[row] == calculate_overall_risk(*names), names
+
+
+def test_adjust_confidence_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    n = 20000
+    sme = rng.integers(0, len(SME_ORDER) + 1, n)
+    risk = rng.integers(0, len(RISK_ORDER) + 1, n)
+    dscr = rng.integers(0, len(DSCR_ORDER) + 1, n)
+    industry = rng.integers(0, len(INDUSTRY_ORDER) + 1, n)
+    min_loan = rng.choice([0.0, 25001.0, 50000.0], n)
+    max_loan = np.where(rng.random(n) < 0.05, min_loan, min_loan + rng.choice([50000.0, 150000.0, 250000.0], n))
+    requested = rng.uniform(0.0, 300000.0, n)
+
+    batch = adjust_confidence_batch(sme, requested, min_loan, max_loan, risk, dscr, industry)
+    for row in range(n):
+        expected = adjust_confidence(_names(SME_ORDER)[sme[row]], float(requested[row]), float(min_loan[row]),
+                                     float(max_loan[row]), _names(RISK_ORDER)[risk[row]],
+                                     _names(DSCR_ORDER)[dscr[row]], _names(INDUSTRY_ORDER)[industry[row]])
+        assert batch[row] == expected, row
+
+
+def test_batch_scoring_accepts_scalar_codes():
+    assert adjust_confidence_batch(0, 60000.0, 25001.0, 150000.0, 0, 0, 0) == adjust_confidence(
+        SME_ORDER[0], 60000.0, 25001.0, 150000.0, RISK_ORDER[0], DSCR_ORDER[0], INDUSTRY_ORDER[0]
+    )
+    assert calculate_overall_risk_batch(0, 0, 0, 0) == calculate_overall_risk(
+        SME_ORDER[0], DSCR_ORDER[0], RISK_ORDER[0], INDUSTRY_ORDER[0]
+    )
@@ -0,0 +1,59 @@
+import io
+import logging
+import queue
+import time
+
+import pytest
+
+import config
+from config import ACCEPTABLE_INDUSTRY_SECTORS, INDUSTRY_RISK_SCORES, global_sme_checks
+from logic import evaluate_application
+
+AGRICULTURE_SPELLINGS = ("Agriculture, Forestry, and Fishing", "Agriculture, Forestry and Fishing")
+
+
+@pytest.mark.parametrize("sector", AGRICULTURE_SPELLINGS)
+def test_agriculture_spellings_score_the_same(sector):
+    assert sector in ACCEPTABLE_INDUSTRY_SECTORS
+    assert INDUSTRY_RISK_SCORES[sector] == 1.0
+    assert global_sme_checks(1.6, 50000.0, "T1", "EB", sector) is None
+
+    result = evaluate_application("EB", "T1", 1.6, 50000.0, "secured", sector, [])
+    assert result["overall_risk"] == 1.0
+    assert result["required_pg"] == 0.2
+
+
+@pytest.mark.parametrize("name", ["adjust_confidence", "calculate_overall_risk", "determine_pg_percentage"])
+def test_scoring_functions_are_re_exported(name):
+    import scoring
+    assert getattr(config, name) is getattr(scoring, name)
+
+
+def _buffered_stream(flush_interval):
+    output = io.StringIO()
+    buffer = config.TimedMemoryHandler(500, flush_interval, flushLevel=logging.ERROR,
+                                       target=logging.StreamHandler(output))
+    return output, buffer
+
+
+def test_listener_flushes_buffered_records_when_idle():
+    output, buffer = _buffered_stream(0.05)
+    log_queue = queue.Queue()
+    listener = config.FlushingQueueListener(log_queue, buffer)
+    listener.start()
+    try:
+        log_queue.put(logging.makeLogRecord({"msg": "decision logged", "levelno": logging.INFO}))
+        deadline = time.monotonic() + 2.0
+        while "decision logged" not in output.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "decision logged" in output.getvalue()
+    finally:
+        listener.stop()
+
+
+def test_buffer_flushes_once_the_oldest_record_is_due():
+    output, buffer = _buffered_stream(0.05)
+    buffer.handle(logging.makeLogRecord({"msg": "first", "levelno": logging.INFO, "created": 100.0}))
+    assert output.getvalue() == ""
+    buffer.handle(logging.makeLogRecord({"msg": "second", "levelno": logging.INFO, "created": 100.06}))
+    assert output.getvalue() == "first\nsecond\n"
@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+import logic
+from config import EvaluationError
+from logic import _DSCR_EDGES, _RISK_RULES, _RULE_ENTRIES, _RULE_TABLE, _compile_rules, _dscr_band, _match_compiled
+
+
+def test_every_rule_floor_is_a_band_edge():
+    for _, _, _, min_dscr, inclusive, *_ in _RISK_RULES:
+        assert logic._rule_floor(min_dscr, inclusive) in _DSCR_EDGES
+
+
+def test_rule_threshold_off_the_band_edges_is_rejected():
+    rule = ("EB", "T3", "secured", 1.5, True, 100000, 0.8, "EB/T3 secured.")
+    with pytest.raises(ValueError, match="not a band edge"):
+        _compile_rules(_RISK_RULES + (rule,), _RULE_ENTRIES + (logic._rule_entry(rule),))
+
+
+@pytest.mark.parametrize("dscr", [1.0, 1.2499, 1.25, math.nextafter(1.25, math.inf), 1.3, 1.5, 2.0])
+def test_rule_table_agrees_with_generated_matcher(dscr):
+    for sme, risk, loan_type, *_ in _RISK_RULES:
+        for loan_amount in (25001.0, 60000.0, 100000.0, 150000.0, 250000.0, 260000.0):
+            entry = _RULE_TABLE.get((sme, risk, _dscr_band(dscr), loan_type))
+            expected = entry if entry is not None and loan_amount <= entry[0] else None
+            assert _match_compiled(sme, risk, dscr, loan_amount, loan_type) == expected
+
+
+def test_uncovered_scenario_raises_evaluation_error():
+    with pytest.raises(EvaluationError, match="No EB rule covers"):
+        logic.evaluate_application("EB", "T3", 1.6, 60000.0, "unsecured", "Wholesale and Retail Trade", [])
+
+
+@pytest.mark.parametrize("loan_amount", [20000.0, 60000.0, 300000.0])
+def test_int_and_float_inputs_give_the_same_decision(loan_amount):
+    args = ("EB", "T1", 1.6, loan_amount, "secured", "Wholesale and Retail Trade", [])
+    as_int = ("EB", "T1", 1.6, int(loan_amount), "secured", "Wholesale and Retail Trade", [])
+    assert logic.evaluate_application(*as_int) == logic.evaluate_application(*args)
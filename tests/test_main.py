@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+SME_PROFILES = ("EB", "ESB", "NTB", "SU", "XX")
+RISK_PROFILES = ("T1", "T2", "T3")
+DSCRS = (1.0, 1.25, 1.3, 1.6)
+LOAN_AMOUNTS = (10000, 25001, 60000, 90000, 200000, 300000)
+LOAN_TYPES = ("secured", "Unsecured")
+
+
+def _scalar(sme, risk, dscr, amount, loan_type):
+    response = client.post("/evaluate/sme-risk", json={
+        "smeProfile": sme, "riskProfile": risk, "stressedDSCR": dscr,
+        "loanAmount": amount, "loanType": loan_type,
+    })
+    if response.status_code == 500:
+        # No rule covers the scenario; the batch endpoint reports these as nulls
+        return None, None, None
+    body = response.json()
+    return body["decision"], body["confidence"], body["explanation"]
+
+
+def test_batch_endpoint_matches_single_endpoint():
+    rows = list(itertools.product(SME_PROFILES, RISK_PROFILES, DSCRS, LOAN_AMOUNTS, LOAN_TYPES))
+    sme, risk, dscr, amount, loan_type = (list(column) for column in zip(*rows))
+    response = client.post("/evaluate/sme-risk-batch", json={
+        "smeProfile": sme, "riskProfile": risk, "stressedDSCR": dscr,
+        "loanAmount": amount, "loanType": loan_type,
+    })
+    assert response.status_code == 200
+    body = response.json()
+
+    for index, row in enumerate(rows):
+        batch = (body["decision"][index], body["confidence"][index], body["explanation"][index])
+        assert batch == _scalar(*row), row
+
+
+def test_batch_endpoint_rejects_ragged_columns():
+    response = client.post("/evaluate/sme-risk-batch", json={
+        "smeProfile": ["EB", "EB"], "riskProfile": ["T1"], "stressedDSCR": [1.6],
+        "loanAmount": [50000], "loanType": ["secured"],
+    })
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("loan_type", ["secured", "Secured", " SECURED "])
+def test_loan_type_is_normalised(loan_type):
+    response = client.post("/evaluate/sme-risk", json={
+        "smeProfile": "EB", "riskProfile": "T1", "stressedDSCR": 1.6,
+        "loanAmount": 200000, "loanType": loan_type,
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["decision"] == "CONDITIONAL_PASS"
+    assert "a secured loan" in body["explanation"]
@@ -0,0 +1,147 @@
+import json
+
+import pytest
+
+import narrative
+
+DECISION = {"decision": "CONDITIONAL_PASS", "confidence": 0.89, "explanation": "EB/T1 qualifies."}
+PLACEHOLDER = narrative.AUDIT_TIMESTAMP_PLACEHOLDER
+TIMESTAMP = "2024-01-01T00:00:00.000Z"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    narrative.clear_narrative_cache()
+    yield
+    narrative.clear_narrative_cache()
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    sent = []
+
+    def fake_call_gpt(prompt, max_tokens=300, json_mode=False):
+        sent.append(prompt)
+        return f"Narrative {len(sent)}. Audit timestamp: {narrative.AUDIT_TIMESTAMP_PLACEHOLDER}"
+
+    monkeypatch.setattr(narrative, "call_gpt", fake_call_gpt)
+    return sent
+
+
+@pytest.fixture
+def fixed_timestamp(monkeypatch):
+    monkeypatch.setattr(narrative, "_audit_timestamp", lambda: TIMESTAMP)
+
+
+def test_repeat_narrative_is_served_from_cache(prompts):
+    first = narrative.generate_underwriter_narrative(dict(DECISION))
+    second = narrative.generate_underwriter_narrative(dict(DECISION))
+    assert len(prompts) == 1
+    assert first.startswith("Narrative 1.") and second.startswith("Narrative 1.")
+
+
+def test_cached_narrative_carries_each_requests_own_timestamp(prompts, monkeypatch):
+    monkeypatch.setattr(narrative, "_audit_timestamp", lambda: "2024-01-01T00:00:00.000Z")
+    first = narrative.generate_underwriter_narrative(dict(DECISION))
+    monkeypatch.setattr(narrative, "_audit_timestamp", lambda: "2024-06-30T12:00:00.000Z")
+    second = narrative.generate_underwriter_narrative(dict(DECISION))
+
+    assert len(prompts) == 1
+    # The prompt (and so the cached text) never contains a real timestamp
+    assert narrative.AUDIT_TIMESTAMP_PLACEHOLDER in prompts[0]
+    assert "2024-01-01" not in prompts[0]
+    assert first.endswith("2024-01-01T00:00:00.000Z")
+    assert second.endswith("2024-06-30T12:00:00.000Z")
+
+
+def test_different_decisions_are_not_shared(prompts):
+    narrative.generate_underwriter_narrative(dict(DECISION))
+    narrative.generate_underwriter_narrative(dict(DECISION, confidence=0.5))
+    assert len(prompts) == 2
+
+
+def test_batch_response_in_a_code_fence_is_parsed(monkeypatch, fixed_timestamp):
+    sent = []
+
+    def fake_call_gpt(prompt, max_tokens=300, json_mode=False):
+        sent.append(json_mode)
+        body = {"narratives": [{"app_id": i, "narrative": f"Batch {i} {PLACEHOLDER}"} for i in range(3)]}
+        return "```json\n" + json.dumps(body) + "\n```"
+
+    monkeypatch.setattr(narrative, "call_gpt", fake_call_gpt)
+    decisions = [dict(DECISION, confidence=c) for c in (0.6, 0.7, 0.8)]
+    assert narrative.generate_underwriter_narratives(decisions) == [f"Batch {i} {TIMESTAMP}" for i in range(3)]
+    assert sent == [True]
+
+
+def test_null_batch_narrative_falls_back_to_a_single_call(monkeypatch, fixed_timestamp):
+    sent = []
+
+    def fake_call_gpt(prompt, max_tokens=300, json_mode=False):
+        sent.append(json_mode)
+        if json_mode:
+            return json.dumps({"narratives": [{"app_id": 0, "narrative": f"Batch 0 {PLACEHOLDER}"},
+                                              {"app_id": 1, "narrative": None}]})
+        return f"Single {PLACEHOLDER}"
+
+    monkeypatch.setattr(narrative, "call_gpt", fake_call_gpt)
+    decisions = [dict(DECISION, confidence=c) for c in (0.6, 0.7)]
+    assert narrative.generate_underwriter_narratives(decisions) == [f"Batch 0 {TIMESTAMP}", f"Single {TIMESTAMP}"]
+    assert sent == [True, False]
+
+
+@pytest.mark.parametrize("text, decision", [
+    ("It did not FAIL any checks; outcome CONDITIONAL_PASS.", "CONDITIONAL_PASS"),
+    ("This is not a FLAG/AI case; the decision is FLAG/UW.", "FLAG/UW"),
+    ("Decision: **FAIL**. A CONDITIONAL_PASS was not possible.", "FAIL"),
+    ("The application was conditionally approved.", "CONDITIONAL_PASS"),
+])
+def test_strict_local_check_ignores_negated_and_passing_mentions(text, decision, monkeypatch):
+    monkeypatch.setattr(narrative, "STRICT_NARRATIVE_CHECK", True)
+    assert narrative._local_narrative_check(text, decision) is None
+
+
+@pytest.mark.parametrize("text, decision", [
+    ("Final decision: FAIL. Conditions for CONDITIONAL_PASS were not met.", "CONDITIONAL_PASS"),
+    ("The outcome is FLAG/AI.", "FLAG/UW"),
+    ("We FAIL this application.", "CONDITIONAL_PASS"),
+])
+def test_local_check_rejects_a_different_outcome(text, decision):
+    result = narrative._local_narrative_check(text, decision)
+    assert result is not None and "No contradictions found" not in result
+
+
+def test_local_check_accepts_the_right_verdict_by_default(prompts):
+    result = narrative.check_underwriter_narrative("It did not FAIL any checks; outcome CONDITIONAL_PASS.",
+                                                   dict(DECISION))
+    assert result == "No contradictions found."
+    assert prompts == []
+
+
+def test_strict_check_sends_the_right_verdict_to_gpt(prompts, monkeypatch):
+    monkeypatch.setattr(narrative, "STRICT_NARRATIVE_CHECK", True)
+    narrative.check_underwriter_narrative("It did not FAIL any checks; outcome CONDITIONAL_PASS.", dict(DECISION))
+    assert len(prompts) == 1
+
+
+def test_check_rejects_locally_without_calling_gpt(prompts):
+    result = narrative.check_underwriter_narrative("Decision: FAIL.", dict(DECISION))
+    assert "FAIL" in result and "No contradictions found" not in result
+    assert prompts == []
+
+
+def test_narrative_without_the_placeholder_still_gets_a_timestamp(monkeypatch, fixed_timestamp):
+    monkeypatch.setattr(narrative, "call_gpt", lambda prompt, max_tokens=300, json_mode=False: "Timestamp dropped.")
+    first = narrative.generate_underwriter_narrative(dict(DECISION))
+    assert first == f"Timestamp dropped.\n\nAudit timestamp: {TIMESTAMP}"
+    # The cached copy keeps the placeholder, so later requests get their own timestamp
+    monkeypatch.setattr(narrative, "_audit_timestamp", lambda: "2024-06-30T12:00:00.000Z")
+    assert narrative.generate_underwriter_narrative(dict(DECISION)).endswith("2024-06-30T12:00:00.000Z")
+
+
+def test_batch_narrative_without_the_placeholder_still_gets_a_timestamp(monkeypatch, fixed_timestamp):
+    body = {"narratives": [{"app_id": 0, "narrative": "Timestamp dropped."}]}
+    monkeypatch.setattr(narrative, "call_gpt", lambda prompt, max_tokens=300, json_mode=False: json.dumps(body))
+    assert narrative.generate_underwriter_narratives([dict(DECISION)]) == [
+        f"Timestamp dropped.\n\nAudit timestamp: {TIMESTAMP}"
+    ]